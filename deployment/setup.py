@@ -25,6 +25,6 @@ setup(name='logomaker',
       install_requires=[
         'numpy',
 		'matplotlib>=2.2.2',
-		'pandas'
+		'pandas>=1.0'
       ],
       zip_safe=False)
\ No newline at end of file
@@ -3,10 +3,19 @@ from logomaker.src.Logo import Logo
 from logomaker.src.Glyph import Glyph
 from logomaker.src.Glyph import list_font_names
 from logomaker.src.matrix import transform_matrix
+from logomaker.src.matrix import batch_transform_matrix
 from logomaker.src.matrix import sequence_to_matrix
+from logomaker.src.matrix import batch_sequence_to_matrix
 from logomaker.src.matrix import alignment_to_matrix
+from logomaker.src.matrix import encoded_alignment_to_matrix
+from logomaker.src.matrix import CountsAccumulator
 from logomaker.src.matrix import saliency_to_matrix
+from logomaker.src.matrix import batch_saliency_to_matrix
 from logomaker.src.validate import validate_matrix
+from logomaker.src.validate import set_validation_level
+from logomaker.src.validate import get_validation_level
+from logomaker.src.validate import validation_level
+from logomaker.src.render import render_logos
 from logomaker.src.colors import list_color_schemes
 from logomaker.src.examples import list_example_matrices
 from logomaker.src.examples import get_example_matrix
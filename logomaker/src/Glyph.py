@@ -12,19 +12,40 @@ from matplotlib.font_manager import FontManager, FontProperties
 from matplotlib.colors import to_rgb
 import matplotlib.pyplot as plt
 from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.path import Path
 from logomaker.src.error_handling import check, handle_errors
+from logomaker.src.validate import get_validation_level
 from logomaker.src.colors import get_rgb
+from collections import OrderedDict
+import threading
 import numpy as np
 
 # Create global font manager instance. This takes a second or two
 font_manager = FontManager()
 
+# Maximum number of glyph outlines kept in the global outline cache
+GLYPH_OUTLINE_CACHE_SIZE = 1024
+
+# Create global outline cache, together with a lock that guards it
+_outline_cache = OrderedDict()
+_outline_cache_lock = threading.Lock()
+
 # Create global list of valid font weights
 VALID_FONT_WEIGHT_STRINGS = [
     'ultralight', 'light', 'normal', 'regular', 'book',
     'medium', 'roman', 'semibold', 'demibold', 'demi',
     'bold', 'heavy', 'extra bold', 'black']
 
+# Attributes affecting the shape or placement of a glyph's path
+GEOMETRY_ATTRIBUTES = ('p', 'c', 'floor', 'ceiling', 'width', 'vpad',
+                       'font_name', 'font_weight', 'dont_stretch_more_than',
+                       'flip', 'mirror')
+
+# Attributes affecting only the appearance of a glyph
+APPEARANCE_ATTRIBUTES = ('color', 'edgecolor', 'edgewidth', 'alpha', 'zorder')
+
 
 def list_font_names():
     """
@@ -48,6 +69,234 @@ def list_font_names():
     return fontnames
 
 
+def _make_axes(figsize, use_pyplot=True):
+    """
+    Creates a new figure of size figsize and returns an Axes object that
+    spans it. If use_pyplot is False, the figure is created directly, with
+    an Agg canvas, instead of through pyplot. Such figures are not tracked
+    by pyplot, so they can be created from multiple threads and are freed
+    as soon as they are no longer referenced.
+    """
+    if use_pyplot:
+        fig, ax = plt.subplots(1, 1, figsize=figsize)
+    else:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+    return ax
+
+
+def _get_glyph_outline(c, font_name, font_weight, flip=False, mirror=False):
+    """
+    Returns the unit-size outline of a character, together with its
+    bounding box. Outlines are shared by all Glyphs in the process and are
+    kept in a least-recently-used cache keyed by character, font_name,
+    font_weight, flip, and mirror.
+
+    parameters
+    ----------
+
+    c: (str)
+        The character whose outline is requested.
+
+    font_name, font_weight: (str, str or number)
+        Font family and font weight, as passed to FontProperties.
+
+    flip, mirror: (bool)
+        Whether the outline should be flipped upside down and/or mirrored.
+
+    returns
+    -------
+    path, bbox: (matplotlib Path, matplotlib Bbox)
+        The (read-only) outline and its extents. Callers must not modify
+        either of these objects.
+    """
+
+    key = (c, font_name, font_weight, flip, mirror)
+    with _outline_cache_lock:
+
+        # On a cache hit, mark outline as most recently used and return it
+        outline = _outline_cache.pop(key, None)
+        if outline is not None:
+            _outline_cache[key] = outline
+            return outline
+
+        # Set font properties of outline
+        font_properties = FontProperties(family=font_name,
+                                         weight=font_weight)
+
+        # Create a path for the character at unit size
+        text_path = TextPath((0, 0), c, size=1, prop=font_properties)
+        vertices = text_path.vertices
+        codes = text_path.codes
+
+        # If need to flip char, do it within path
+        if flip:
+            vertices = vertices * [1, -1]
+
+        # If need to mirror char, do it within path
+        if mirror:
+            vertices = vertices * [-1, 1]
+
+        # Store a read-only copy of the path together with its extents
+        path = Path(vertices, codes, readonly=True)
+        outline = (path, path.get_extents())
+        _outline_cache[key] = outline
+
+        # Evict least recently used outlines if cache is full
+        while len(_outline_cache) > GLYPH_OUTLINE_CACHE_SIZE:
+            _outline_cache.popitem(last=False)
+
+    return outline
+
+
+def _get_glyph_path(p,
+                    c,
+                    floor,
+                    ceiling,
+                    width=0.95,
+                    vpad=0.0,
+                    font_name='sans',
+                    font_weight='bold',
+                    dont_stretch_more_than='E',
+                    flip=False,
+                    mirror=False):
+    """
+    Returns the path of a character scaled and positioned to fill the
+    bounding box of a glyph. Parameters are as in the Glyph constructor.
+
+    returns
+    -------
+    char_path: (matplotlib Path or None)
+        The path of the glyph, or None if the glyph has zero height.
+    """
+
+    # Get unit-size outline and the transformation that places it
+    placement = _get_glyph_placement(p=p,
+                                     c=c,
+                                     floor=floor,
+                                     ceiling=ceiling,
+                                     width=width,
+                                     vpad=vpad,
+                                     font_name=font_name,
+                                     font_weight=font_weight,
+                                     dont_stretch_more_than=
+                                     dont_stretch_more_than,
+                                     flip=flip,
+                                     mirror=mirror)
+
+    # If height is zero, there is no path
+    if placement is None:
+        return None
+
+    tmp_path, transformation = placement
+    return transformation.transform_path(tmp_path)
+
+
+def _get_glyph_placement(p,
+                         c,
+                         floor,
+                         ceiling,
+                         width=0.95,
+                         vpad=0.0,
+                         font_name='sans',
+                         font_weight='bold',
+                         dont_stretch_more_than='E',
+                         flip=False,
+                         mirror=False):
+    """
+    Returns the unit-size outline of a character, together with the affine
+    transformation that scales and positions the outline to fill the
+    bounding box of a glyph. Parameters are as in the Glyph constructor.
+
+    returns
+    -------
+    tmp_path, transformation: (matplotlib Path, matplotlib Affine2D)
+        The (read-only) outline and its transformation, or None if the
+        glyph has zero height.
+    """
+
+    # Set height
+    height = ceiling - floor
+
+    # If height is zero, there is no placement
+    if height == 0.0:
+        return None
+
+    # Set bounding box for character,
+    # leaving requested amount of padding above and below the character
+    char_xmin = p - width / 2.0
+    char_ymin = floor + vpad * height / 2.0
+    char_width = width
+    char_height = height - vpad * height
+    bbox = Bbox.from_bounds(char_xmin,
+                            char_ymin,
+                            char_width,
+                            char_height)
+
+    # Get unit-size outline for the character, which does not yet have the
+    # correct position or scaling. This outline is already flipped
+    # and/or mirrored as requested.
+    tmp_path, tmp_bbox = _get_glyph_outline(c,
+                                            font_name,
+                                            font_weight,
+                                            flip,
+                                            mirror)
+
+    # Get the bounding box of a glyph representing
+    # the max stretched character
+    msc_path, msc_bbox = _get_glyph_outline(dont_stretch_more_than,
+                                            font_name,
+                                            font_weight)
+
+    # Compute horizontal stretch factor needed for tmp_path
+    hstretch_tmp = bbox.width / tmp_bbox.width
+
+    # Compute horizontal stretch factor needed for msc_path
+    hstretch_msc = bbox.width / msc_bbox.width
+
+    # Choose the MINIMUM of these two horizontal stretch factors.
+    # This prevents very narrow characters, such as 'I', from being
+    # stretched too much.
+    hstretch = min(hstretch_tmp, hstretch_msc)
+
+    # Compute the new character width, accounting for the
+    # limit placed on the stretching factor
+    char_width = hstretch * tmp_bbox.width
+
+    # Compute how much to horizontally shift the character path
+    char_shift = (bbox.width - char_width) / 2.0
+
+    # Compute vertical stetch factor needed for tmp_path
+    vstretch = bbox.height / tmp_bbox.height
+
+    # THESE ARE THE ESSENTIAL TRANSFORMATIONS
+    # 1. First, translate char path so that lower left corner is at origin
+    # 2. Then scale char path to desired width and height
+    # 3. Finally, translate char path to desired position
+    transformation = Affine2D() \
+        .translate(tx=-tmp_bbox.xmin, ty=-tmp_bbox.ymin) \
+        .scale(sx=hstretch, sy=vstretch) \
+        .translate(tx=bbox.xmin + char_shift, ty=bbox.ymin)
+
+    return tmp_path, transformation
+
+
+class _LazyPathPatch(PathPatch):
+    """
+    A PathPatch whose path is computed by the Glyph that owns it, and only
+    when the path is first needed, e.g., when the patch is drawn.
+    """
+
+    def __init__(self, glyph, **kwargs):
+        PathPatch.__init__(self, Path(np.zeros((0, 2))), **kwargs)
+        self._glyph = glyph
+
+    def get_path(self):
+        self._glyph._update_path()
+        return self._path
+
+
 class Glyph:
     """
     A Glyph represents a character, drawn on a specified axes at a specified
@@ -127,6 +376,12 @@ class Glyph:
     figsize: ([float, float]):
         The default figure size for the rendered glyph; only used if ax is
         not supplied by the user.
+
+    use_pyplot: (bool)
+        If ax is not supplied by the user, whether to create the figure
+        using pyplot. If False, a matplotlib Figure with an Agg canvas is
+        created directly; this is thread safe and keeps no global state,
+        but the figure is not shown by plt.show().
     """
 
     @handle_errors
@@ -148,7 +403,8 @@ class Glyph:
                  mirror=False,
                  zorder=None,
                  alpha=1,
-                 figsize=(1, 1)):
+                 figsize=(1, 1),
+                 use_pyplot=True):
 
         # Set attributes
         self.p = p
@@ -169,14 +425,35 @@ class Glyph:
         self.font_name = font_name
         self.font_weight = font_weight
         self.figsize = figsize
+        self.use_pyplot = use_pyplot
 
-        # Check inputs
-        self._input_checks()
+        # Check inputs, or only convert them if validation is off. Checks
+        # are performed at the 'fast' level, since their cost does not grow
+        # with the size of the data.
+        if get_validation_level() != 'off':
+            self._input_checks()
+        else:
+            self._convert_inputs()
 
-        # If ax is not set, set to current axes object
+        # If ax is not set, create a new figure and axes object
         if self.ax is None:
-            fig, ax = plt.subplots(1, 1, figsize=self.figsize)
-            self.ax = ax
+            self.ax = _make_axes(self.figsize, self.use_pyplot)
+
+        # Register Glyph as attached to ax, i.e., its patch is drawn on ax
+        self._attached = True
+
+        # GlyphTable, and row therein, that describes this Glyph, if any.
+        # These are set by Logo objects that own the Glyph.
+        self._table = None
+        self._row = None
+
+        # Function called after attributes of a detached Glyph are set, so
+        # that its owner can redraw it. Set by Logo objects that own the
+        # Glyph.
+        self._on_change = None
+
+        # Whether the path of patch must be recomputed before it is used
+        self._path_stale = True
 
         # Make patch
         self._make_patch()
@@ -191,8 +468,40 @@ class Glyph:
             Attributes and their values.
         """
 
-        # remove drawn patch
-        if (self.patch is not None) and (self.patch.axes is not None):
+        # if Glyph is described by a GlyphTable, record changes there too.
+        # If the Glyph is detached, its owner must also redraw it.
+        if self._table is not None:
+            table_kwargs = dict([(k, v) for k, v in kwargs.items()
+                                 if k in self._table.attributes])
+            self._table.set(self._row,
+                            dirty=not self._attached,
+                            **table_kwargs)
+
+        # set attributes and remake patch
+        self._set_attributes(**kwargs)
+
+        # if Glyph is detached, have its owner redraw it
+        if (not self._attached) and (self._on_change is not None):
+            self._on_change()
+
+    def _set_attributes(self, **kwargs):
+        """
+        Sets attributes of the Glyph and updates its patch, without
+        recording changes in a GlyphTable. If only appearance attributes
+        change, the existing patch is updated in place; otherwise the patch
+        is remade.
+        """
+
+        # determine whether any attribute other than an appearance
+        # attribute is being changed
+        remake = any((key not in APPEARANCE_ATTRIBUTES) and
+                     ((key not in GEOMETRY_ATTRIBUTES) or
+                      (self.__dict__.get(key) != value))
+                     for key, value in kwargs.items())
+
+        # remove drawn patch if it is to be remade
+        if remake and (self.patch is not None) and \
+                (self.patch.axes is not None):
             self.patch.remove()
 
         # set each attribute passed by user
@@ -205,8 +514,15 @@ class Glyph:
             # save variable name
             self.__dict__[key] = value
 
-        # remake patch
-        self._make_patch()
+        # remake patch, or update its appearance in place
+        if remake:
+            self._make_patch()
+        elif self.patch is not None:
+            self.patch.set_facecolor(self.color)
+            self.patch.set_edgecolor(self.edgecolor)
+            self.patch.set_linewidth(self.edgewidth)
+            self.patch.set_alpha(self.alpha)
+            self.patch.set_zorder(self.zorder)
 
     def draw(self):
         """
@@ -223,103 +539,91 @@ class Glyph:
 
         # Draw character
         if self.patch is not None:
-            self.ax.add_patch(self.patch)
+            self._add_patch()
 
     def _make_patch(self):
         """
-        Returns an appropriately scaled patch object corresponding to
-        the Glyph.
+        Creates the patch object corresponding to the Glyph. The path of the
+        patch is not computed here, but only when it is first needed, e.g.,
+        when the patch is drawn. See _update_path().
         """
 
-        # Set height
-        height = self.ceiling - self.floor
-
         # If height is zero, set patch to None and return None
-        if height == 0.0:
+        if self.ceiling - self.floor == 0.0:
             self.patch = None
             return None
 
-        # Set bounding box for character,
-        # leaving requested amount of padding above and below the character
-        char_xmin = self.p - self.width / 2.0
-        char_ymin = self.floor + self.vpad * height / 2.0
-        char_width = self.width
-        char_height = height - self.vpad * height
-        bbox = Bbox.from_bounds(char_xmin,
-                                char_ymin,
-                                char_width,
-                                char_height)
-
-        # Set font properties of Glyph
-        font_properties = FontProperties(family=self.font_name,
-                                         weight=self.font_weight)
-
-        # Create a path for Glyph that does not yet have the correct
-        # position or scaling
-        tmp_path = TextPath((0, 0), self.c, size=1,
-                            prop=font_properties)
-
-        # Create create a corresponding path for a glyph representing
-        # the max stretched character
-        msc_path = TextPath((0, 0), self.dont_stretch_more_than, size=1,
-                            prop=font_properties)
-
-        # If need to flip char, do it within tmp_path
-        if self.flip:
-            transformation = Affine2D().scale(sx=1, sy=-1)
-            tmp_path = transformation.transform_path(tmp_path)
-
-        # If need to mirror char, do it within tmp_path
-        if self.mirror:
-            transformation = Affine2D().scale(sx=-1, sy=1)
-            tmp_path = transformation.transform_path(tmp_path)
-
-        # Get bounding box for temporary character and max_stretched_character
-        tmp_bbox = tmp_path.get_extents()
-        msc_bbox = msc_path.get_extents()
-
-        # Compute horizontal stretch factor needed for tmp_path
-        hstretch_tmp = bbox.width / tmp_bbox.width
-
-        # Compute horizontal stretch factor needed for msc_path
-        hstretch_msc = bbox.width / msc_bbox.width
-
-        # Choose the MINIMUM of these two horizontal stretch factors.
-        # This prevents very narrow characters, such as 'I', from being
-        # stretched too much.
-        hstretch = min(hstretch_tmp, hstretch_msc)
-
-        # Compute the new character width, accounting for the
-        # limit placed on the stretching factor
-        char_width = hstretch * tmp_bbox.width
-
-        # Compute how much to horizontally shift the character path
-        char_shift = (bbox.width - char_width) / 2.0
-
-        # Compute vertical stetch factor needed for tmp_path
-        vstretch = bbox.height / tmp_bbox.height
-
-        # THESE ARE THE ESSENTIAL TRANSFORMATIONS
-        # 1. First, translate char path so that lower left corner is at origin
-        # 2. Then scale char path to desired width and height
-        # 3. Finally, translate char path to desired position
-        # char_path is the resulting path used for the Glyph
-        transformation = Affine2D() \
-            .translate(tx=-tmp_bbox.xmin, ty=-tmp_bbox.ymin) \
-            .scale(sx=hstretch, sy=vstretch) \
-            .translate(tx=bbox.xmin + char_shift, ty=bbox.ymin)
-        char_path = transformation.transform_path(tmp_path)
-
-        # Convert char_path to a patch, which can now be drawn on demand
-        self.patch = PathPatch(char_path,
-                               facecolor=self.color,
-                               zorder=self.zorder,
-                               alpha=self.alpha,
-                               edgecolor=self.edgecolor,
-                               linewidth=self.edgewidth)
-
-        # add patch to axes
-        self.ax.add_patch(self.patch)
+        # Create patch, which will compute its path on demand
+        self.patch = _LazyPathPatch(self,
+                                    facecolor=self.color,
+                                    zorder=self.zorder,
+                                    alpha=self.alpha,
+                                    edgecolor=self.edgecolor,
+                                    linewidth=self.edgewidth)
+        self._path_stale = True
+
+        # add patch to axes, unless Glyph has been detached from ax
+        if self._attached:
+            self._add_patch()
+
+    def _add_patch(self):
+        """
+        Adds patch to ax without computing its path. ax.add_patch() is not
+        used because it computes the path in order to update the data
+        limits of ax; the Glyph's bounding box is used instead.
+        """
+        self.ax.add_artist(self.patch)
+        self.ax.update_datalim([(self.p - self.width/2.0, self.floor),
+                                (self.p + self.width/2.0, self.ceiling)])
+
+    def _update_path(self):
+        """
+        Computes the path of the Glyph's patch if the path is out of date.
+        """
+        if self._path_stale:
+            self.patch._path = _get_glyph_path(p=self.p,
+                                               c=self.c,
+                                               floor=self.floor,
+                                               ceiling=self.ceiling,
+                                               width=self.width,
+                                               vpad=self.vpad,
+                                               font_name=self.font_name,
+                                               font_weight=self.font_weight,
+                                               dont_stretch_more_than=
+                                               self.dont_stretch_more_than,
+                                               flip=self.flip,
+                                               mirror=self.mirror)
+            self._path_stale = False
+
+    def _detach(self):
+        """
+        Removes the Glyph's patch from ax and stops the patch from being
+        added back when the Glyph is modified. Used when the Glyph is
+        rendered by a Logo as part of a PathCollection.
+        """
+
+        # remove drawn patch
+        if (self.patch is not None) and (self.patch.axes is not None):
+            self.patch.remove()
+
+        # register Glyph as detached
+        self._attached = False
+
+    def _convert_inputs(self):
+        """
+        Converts input parameters to the types used internally, without
+        checking them. Used instead of _input_checks() when the validation
+        level is 'off'.
+        """
+        self.floor = float(self.floor)
+        self.ceiling = float(self.ceiling)
+        self.color = get_rgb(self.color)
+        self.edgecolor = get_rgb(self.edgecolor)
+        self.edgewidth = float(self.edgewidth)
+        self.flip = bool(self.flip)
+        self.mirror = bool(self.mirror)
+        self.alpha = float(self.alpha)
+        self.figsize = tuple(self.figsize)
 
     def _input_checks(self):
 
@@ -329,7 +633,7 @@ class Glyph:
 
         from numbers import Number
         # validate p
-        check(isinstance(int(self.p), (float, int)),
+        check(isinstance(self.p, Number),
               'type(p) = %s must be a number' % type(self.p))
 
         # check c is of type str
@@ -451,4 +755,9 @@ class Glyph:
                    for n in self.figsize]),
               'all elements of figsize array must be numbers > 0.')
 
+        # validate that use_pyplot is boolean
+        check(isinstance(self.use_pyplot, bool),
+              'type(use_pyplot) = %s; must be of type bool ' %
+              type(self.use_pyplot))
+
 
@@ -0,0 +1,500 @@
+from __future__ import division
+import numpy as np
+from matplotlib.collections import PathCollection
+
+from logomaker.src.error_handling import check
+from logomaker.src.colors import get_rgb
+from logomaker.src.validate import _is_full_validation
+from logomaker.src.Glyph import VALID_FONT_WEIGHT_STRINGS, _get_glyph_path, \
+    _get_glyph_placement, GEOMETRY_ATTRIBUTES, APPEARANCE_ATTRIBUTES
+
+# All glyph attributes stored in a GlyphTable
+GLYPH_ATTRIBUTES = GEOMETRY_ATTRIBUTES + APPEARANCE_ATTRIBUTES
+
+
+class GlyphTable:
+    """
+    A GlyphTable stores the attributes of many glyphs as NumPy arrays, with
+    one entry per glyph. Logo objects use a GlyphTable to describe their
+    glyphs, so that glyphs can be queried and restyled using vectorized
+    operations. Matplotlib artists are built from the table only when needed.
+
+    attributes
+    ----------
+
+    p: (np.ndarray)
+        x-coordinate value on which to center each glyph.
+
+    codes: (np.ndarray of int)
+        Index of each glyph's character within chars.
+
+    chars: (list of str)
+        The characters referred to by codes.
+
+    floor, ceiling: (np.ndarray of float)
+        y-coordinate values of the bottom and top of each glyph.
+
+    width, vpad, edgewidth, alpha: (np.ndarray of float)
+        Width, vertical padding, edge width, and opacity of each glyph.
+
+    color, edgecolor: (np.ndarray of float, shape (N, 3))
+        RGB face and edge colors of each glyph.
+
+    flip, mirror: (np.ndarray of bool)
+        Whether each glyph is flipped upside down and/or mirrored.
+
+    zorder: (np.ndarray of float)
+        Placement of each glyph in the z-stack; NaN means unspecified.
+
+    font_name, font_weight, dont_stretch_more_than: (np.ndarray of object)
+        Font settings of each glyph.
+
+    dirty: (np.ndarray of bool)
+        Which glyphs have changed since artists were last updated.
+
+    geometry_dirty: (np.ndarray of bool)
+        Which glyphs have changed geometry attributes since artists were
+        last updated, and so need their paths recomputed.
+
+    All attributes other than chars, codes, dirty, and geometry_dirty have
+    the same meaning as the corresponding attributes of the Glyph class.
+    """
+
+    def __init__(self,
+                 p,
+                 c,
+                 floor,
+                 ceiling,
+                 width=0.95,
+                 vpad=0.00,
+                 font_name='sans',
+                 font_weight='bold',
+                 color='gray',
+                 edgecolor='black',
+                 edgewidth=0.0,
+                 dont_stretch_more_than='E',
+                 flip=False,
+                 mirror=False,
+                 zorder=None,
+                 alpha=1):
+
+        # validate p and set number of glyphs
+        p = np.asarray(p)
+        check(p.ndim == 1,
+              'p must be one-dimensional; has shape %s' % repr(p.shape))
+        self.p = _validate_numbers('p', p)
+        self.N = len(self.p)
+
+        # allocate arrays
+        self.codes = np.zeros(self.N, dtype=int)
+        self.chars = []
+        self.floor = np.zeros(self.N)
+        self.ceiling = np.zeros(self.N)
+        self.width = np.zeros(self.N)
+        self.vpad = np.zeros(self.N)
+        self.font_name = np.empty(self.N, dtype=object)
+        self.font_weight = np.empty(self.N, dtype=object)
+        self.color = np.zeros((self.N, 3))
+        self.edgecolor = np.zeros((self.N, 3))
+        self.edgewidth = np.zeros(self.N)
+        self.dont_stretch_more_than = np.empty(self.N, dtype=object)
+        self.flip = np.zeros(self.N, dtype=bool)
+        self.mirror = np.zeros(self.N, dtype=bool)
+        self.zorder = np.zeros(self.N)
+        self.alpha = np.zeros(self.N)
+        self.dirty = np.ones(self.N, dtype=bool)
+        self.geometry_dirty = np.ones(self.N, dtype=bool)
+
+        # fill arrays, validating all values
+        self.set(slice(None),
+                 c=c,
+                 floor=floor,
+                 ceiling=ceiling,
+                 width=width,
+                 vpad=vpad,
+                 font_name=font_name,
+                 font_weight=font_weight,
+                 color=color,
+                 edgecolor=edgecolor,
+                 edgewidth=edgewidth,
+                 dont_stretch_more_than=dont_stretch_more_than,
+                 flip=flip,
+                 mirror=mirror,
+                 zorder=zorder,
+                 alpha=alpha)
+
+    # Names of the glyph attributes stored in a GlyphTable
+    attributes = GLYPH_ATTRIBUTES
+
+    def __len__(self):
+        return self.N
+
+    @property
+    def c(self):
+        """ Array listing the character of each glyph. """
+        return np.array(self.chars, dtype=object)[self.codes]
+
+    @property
+    def height(self):
+        """ Array listing the height (ceiling - floor) of each glyph. """
+        return self.ceiling - self.floor
+
+    def set(self, rows, dirty=True, **kwargs):
+        """
+        Sets the attributes of the specified glyphs.
+
+        parameters
+        ----------
+
+        rows: (int, slice, array of ints, or boolean array)
+            The glyphs to modify.
+
+        dirty: (bool)
+            Whether to mark the modified glyphs as needing their artists
+            updated.
+
+        **kwargs:
+            Glyph attributes and their values. Each value can be a single
+            value, which is used for all specified glyphs, or an array
+            with one value per specified glyph.
+        """
+
+        # get indices of glyphs to modify
+        rows = np.arange(self.N)[rows]
+
+        # validate and convert each attribute before modifying any, so that
+        # the table is left unchanged if any check fails
+        values = {}
+        chars = self.chars
+        for key, value in kwargs.items():
+
+            check(key in GLYPH_ATTRIBUTES,
+                  'invalid glyph attribute %s; must be one of %s' %
+                  (repr(key), GLYPH_ATTRIBUTES))
+
+            if key == 'c':
+                key = 'codes'
+                value, chars = self._encode(value)
+
+            elif key in ('color', 'edgecolor'):
+                value = _validate_colors(key, value)
+
+            elif key in ('flip', 'mirror'):
+                value = np.asarray(value)
+                check(value.dtype == bool,
+                      '%s must be of type bool' % key)
+
+            elif key in ('font_name', 'dont_stretch_more_than'):
+                value = _validate_strings(key, value)
+
+            elif key == 'font_weight':
+                value = _validate_font_weights(value)
+
+            elif key == 'zorder' and value is None:
+                value = np.nan
+
+            else:
+                value = _validate_numbers(key, value)
+
+            values[key] = _broadcast(key, value,
+                                     np.shape(getattr(self, key)[rows]))
+
+        # check floor <= ceiling
+        if (('floor' in values) or ('ceiling' in values)) and \
+                _is_full_validation():
+            floor = values.get('floor', self.floor[rows])
+            ceiling = values.get('ceiling', self.ceiling[rows])
+            check(np.all(floor <= ceiling),
+                  'must have floor <= ceiling for all glyphs.')
+
+        # set attributes, recording which glyphs' geometry changes
+        self.chars = chars
+        for key, value in values.items():
+            array = getattr(self, key)
+            if dirty and (key == 'codes' or key in GEOMETRY_ATTRIBUTES):
+                self.geometry_dirty[rows] |= (array[rows] != value)
+            array[rows] = value
+
+        # mark glyphs as modified
+        if dirty:
+            self.dirty[rows] = True
+
+    def get(self, row):
+        """
+        Returns a dictionary containing the attributes of a single glyph,
+        suitable for passing to the Glyph constructor.
+        """
+
+        zorder = self.zorder[row]
+        return dict(p=float(self.p[row]),
+                    c=self.chars[self.codes[row]],
+                    floor=float(self.floor[row]),
+                    ceiling=float(self.ceiling[row]),
+                    width=float(self.width[row]),
+                    vpad=float(self.vpad[row]),
+                    font_name=self.font_name[row],
+                    font_weight=self.font_weight[row],
+                    color=self.color[row].copy(),
+                    edgecolor=self.edgecolor[row].copy(),
+                    edgewidth=float(self.edgewidth[row]),
+                    dont_stretch_more_than=self.dont_stretch_more_than[row],
+                    flip=bool(self.flip[row]),
+                    mirror=bool(self.mirror[row]),
+                    zorder=None if np.isnan(zorder) else float(zorder),
+                    alpha=float(self.alpha[row]))
+
+    def get_path(self, row):
+        """
+        Returns the path of a single glyph, or None if the glyph has zero
+        height.
+        """
+        return _get_glyph_path(**self._get_geometry(row))
+
+    def get_placement(self, row):
+        """
+        Returns the unit-size outline of a single glyph together with the
+        affine transformation that places it, or None if the glyph has zero
+        height.
+        """
+        return _get_glyph_placement(**self._get_geometry(row))
+
+    def _get_geometry(self, row):
+        """
+        Returns a dictionary containing the geometry attributes of a single
+        glyph.
+        """
+        return dict(p=self.p[row],
+                    c=self.chars[self.codes[row]],
+                    floor=self.floor[row],
+                    ceiling=self.ceiling[row],
+                    width=self.width[row],
+                    vpad=self.vpad[row],
+                    font_name=self.font_name[row],
+                    font_weight=self.font_weight[row],
+                    dont_stretch_more_than=self.dont_stretch_more_than[row],
+                    flip=self.flip[row],
+                    mirror=self.mirror[row])
+
+    def get_rgba(self, rows, key='color'):
+        """
+        Returns an array of RGBA colors for the specified glyphs, combining
+        their RGB color (key='color') or edgecolor (key='edgecolor') with
+        their alpha.
+        """
+        return np.column_stack([getattr(self, key)[rows], self.alpha[rows]])
+
+    def get_datalim(self, rows):
+        """
+        Returns the lower-left and upper-right corners of the rectangle
+        bounding the specified glyphs.
+        """
+        half_width = self.width[rows]/2.0
+        return np.array([[np.min(self.p[rows] - half_width),
+                          np.min(self.floor[rows])],
+                         [np.max(self.p[rows] + half_width),
+                          np.max(self.ceiling[rows])]])
+
+    def pop_dirty(self):
+        """
+        Returns the indices of glyphs marked as modified, together with a
+        boolean array flagging those whose geometry has changed, and clears
+        these marks.
+        """
+        rows = np.flatnonzero(self.dirty)
+        geometry_changed = self.geometry_dirty[rows]
+        self.dirty[rows] = False
+        self.geometry_dirty[rows] = False
+        return rows, geometry_changed
+
+    def _encode(self, c):
+        """
+        Returns the codes of the character(s) in c, together with the list
+        of characters the codes refer to. This is self.chars, extended by a
+        copy if c contains new characters.
+        """
+
+        # get unique characters and an inverse index into them
+        c = np.asarray(c, dtype=object)
+        check(all(isinstance(x, str) for x in set(c.ravel().tolist())),
+              'c must be of type str')
+        uniques, inverse = np.unique(c.astype(str), return_inverse=True)
+
+        # look up or create a code for each unique character
+        chars = self.chars
+        codes = np.zeros(len(uniques), dtype=int)
+        for i, u in enumerate(uniques):
+            if u not in chars:
+                chars = chars + [str(u)]
+            codes[i] = chars.index(u)
+
+        return codes[inverse].reshape(c.shape), chars
+
+
+class GlyphCollection(PathCollection):
+    """
+    A PathCollection that renders the specified glyphs of a GlyphTable.
+    The path of each glyph is computed only when first needed, e.g., when
+    the collection is drawn, and is recomputed only after update_glyphs()
+    is called for that glyph.
+
+    parameters
+    ----------
+
+    table: (GlyphTable)
+        The table describing the glyphs.
+
+    rows: (array of ints)
+        The rows of table to render, all of which must have nonzero height.
+
+    **kwargs:
+        Other keyword arguments passed to PathCollection, e.g. zorder.
+    """
+
+    def __init__(self, table, rows, **kwargs):
+        self.table = table
+        self.rows = np.asarray(rows, dtype=int)
+        self._stale_paths = np.ones(len(self.rows), dtype=bool)
+        PathCollection.__init__(self,
+                                [None]*len(self.rows),
+                                facecolors=table.get_rgba(self.rows),
+                                edgecolors=table.get_rgba(self.rows,
+                                                          'edgecolor'),
+                                linewidths=table.edgewidth[self.rows],
+                                **kwargs)
+
+    def update_glyphs(self, indices, geometry_changed=True):
+        """
+        Refreshes the colors and edge widths of the glyphs at the specified
+        indices within the collection. The paths of glyphs whose geometry
+        has changed are marked as needing to be recomputed; those of glyphs
+        whose appearance alone has changed are kept.
+
+        parameters
+        ----------
+
+        indices: (array of ints)
+            Indices of glyphs within the collection.
+
+        geometry_changed: (bool or array of bools)
+            Whether the geometry of all glyphs, or of each glyph, has changed.
+        """
+
+        # get current colors and edge widths of all members
+        facecolors = np.array(self.get_facecolor())
+        edgecolors = np.array(self.get_edgecolor())
+        linewidths = np.array(self.get_linewidth(), dtype=float)
+
+        # modify those of the specified members
+        rows = self.rows[indices]
+        facecolors[indices] = self.table.get_rgba(rows)
+        edgecolors[indices] = self.table.get_rgba(rows, 'edgecolor')
+        linewidths[indices] = self.table.edgewidth[rows]
+        self.set_facecolor(facecolors)
+        self.set_edgecolor(edgecolors)
+        self.set_linewidth(linewidths)
+
+        # mark paths of glyphs whose geometry changed as stale
+        indices = np.asarray(indices)
+        geometry_changed = np.broadcast_to(geometry_changed, indices.shape)
+        self._stale_paths[indices[geometry_changed]] = True
+        self.stale = True
+
+    def get_paths(self):
+        # compute stale paths only
+        for index in np.flatnonzero(self._stale_paths):
+            self._paths[index] = self.table.get_path(self.rows[index])
+        self._stale_paths[:] = False
+        return self._paths
+
+
+def _broadcast(key, value, shape):
+    """
+    Broadcasts the validated value of attribute key to the shape of the
+    glyph rows it is to be stored in.
+    """
+    value = np.asarray(value)
+    try:
+        value = np.broadcast_to(value, shape)
+    except ValueError:
+        check(False, '%s has shape %s; must be a single value or have one '
+                     'value per glyph' % (key, repr(value.shape)))
+
+    # return a single value as a scalar, so that it is stored as such in
+    # arrays of objects
+    return value[()] if value.ndim == 0 else value
+
+
+def _validate_numbers(key, value):
+    """ Validates numerical glyph attribute values. """
+
+    # check that values are numbers
+    value = np.asarray(value)
+    check(np.issubdtype(value.dtype, np.number) and value.dtype != bool,
+          'type(%s) = %s must be a number' % (key, type(value)))
+    value = value.astype(float)
+
+    # check value ranges, unless not performing full validation
+    if not _is_full_validation():
+        pass
+    elif key == 'width':
+        check(np.all(value > 0), 'width must be > 0')
+    elif key == 'vpad':
+        check(np.all((0 <= value) & (value < 1)),
+              'vpad must be >= 0 and < 1')
+    elif key == 'edgewidth':
+        check(np.all(value >= 0), 'edgewidth must be >= 0')
+    elif key == 'alpha':
+        check(np.all((0 <= value) & (value <= 1)),
+              'alpha must be between 0.0 and 1.0 (inclusive)')
+
+    return value
+
+
+def _validate_colors(key, value):
+    """ Validates a single color specification or an (N, 3) RGB array. """
+
+    # an (N, 3) array of RGB values
+    if isinstance(value, np.ndarray) and value.ndim == 2:
+        check(value.shape[1] == 3,
+              '%s, if a 2D array, must have 3 columns' % key)
+        if _is_full_validation():
+            check(np.all((0 <= value) & (value <= 1)),
+                  'Values of %s must be between 0 and 1 inclusive.' % key)
+        return value
+
+    # a single color specification
+    return get_rgb(value)
+
+
+def _validate_strings(key, value):
+    """ Validates string-valued glyph attributes. """
+
+    # a single string
+    if isinstance(value, str):
+        check(key != 'dont_stretch_more_than' or len(value) == 1,
+              'dont_stretch_more_than must have length 1')
+        return value
+
+    # an array of strings
+    value = np.asarray(value, dtype=object)
+    if _is_full_validation():
+        check(all(isinstance(x, str) for x in value.ravel()),
+              '%s must be of type str' % key)
+    return value
+
+
+def _validate_font_weights(value):
+    """ Validates font_weight values. """
+
+    values = value.ravel().tolist() if isinstance(value, np.ndarray) \
+        else [value]
+    for x in set(values):
+        check(isinstance(x, (str, int)),
+              'type(font_weight) = %s should either be a string or an int' %
+              type(x))
+        if isinstance(x, str):
+            check(x in VALID_FONT_WEIGHT_STRINGS,
+                  'font_weight must be one of %s' % VALID_FONT_WEIGHT_STRINGS)
+        else:
+            check(0 <= x <= 1000, 'font_weight must be in range [0,1000]')
+    return value
@@ -5,20 +5,23 @@ import pandas as pd
 # explicitly set a matplotlib backend if called from python to avoid the
 # 'Python is not installed as a framework... error'
 import sys
+from contextlib import contextmanager
 if sys.version_info[0] == 2:
     import matplotlib
     matplotlib.use('TkAgg')
 
 import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
+from matplotlib.patches import Rectangle, PathPatch
 from matplotlib.axes import Axes
 
 # Import stuff from logomaker
-from logomaker.src.Glyph import Glyph
+from logomaker.src.Glyph import Glyph, _make_axes
+from logomaker.src.GlyphTable import GlyphTable, GlyphCollection
 from logomaker.src.validate import validate_matrix
 from logomaker.src.error_handling import check, handle_errors
 from logomaker.src.colors import get_color_dict, get_rgb
 from logomaker.src.matrix import transform_matrix
+from logomaker.src.svg import glyphs_to_svg
 
 
 class Logo:
@@ -117,6 +120,19 @@ class Logo:
         The default figure size for the rendered logo; only used if ax is
         not supplied by the user.
 
+    use_collection: (bool)
+        If True, glyphs are rendered using one matplotlib PathCollection per
+        zorder value instead of one PathPatch per glyph. This greatly
+        reduces the time and memory needed to draw or save logos with many
+        positions. Glyphs can still be restyled using the style_* methods.
+
+    use_pyplot: (bool)
+        If ax is not supplied by the user, whether to create the figure
+        using pyplot. If False, a matplotlib Figure with an Agg canvas is
+        created directly; this is thread safe and keeps no global state,
+        but the figure is not shown by plt.show(). Use Logo.fig.savefig()
+        to save such logos.
+
     **kwargs:
         Additional key word arguments to send to the Glyph constructor.
     """
@@ -140,6 +156,8 @@ class Logo:
                  ax=None,
                  zorder=0,
                  figsize=(10, 2.5),
+                 use_collection=False,
+                 use_pyplot=True,
                  **kwargs):
 
         # set class attributes
@@ -160,6 +178,8 @@ class Logo:
         self.zorder = zorder
         self.figsize = figsize
         self.ax = ax
+        self.use_collection = use_collection
+        self.use_pyplot = use_pyplot
 
         # save other keyword arguments
         self.glyph_kwargs = kwargs
@@ -168,6 +188,17 @@ class Logo:
         # This is changed to True after all Glyphs have been rendered
         self.has_been_drawn = False
 
+        # PathCollections used to render glyphs if use_collection is True.
+        # These are built when the logo is first drawn.
+        self._glyph_collections = None
+
+        # Glyph objects are created from self.glyph_table only when needed
+        self._glyphs = None
+        self._glyph_df = None
+
+        # number of nested batch_update() blocks currently entered
+        self._batch_depth = 0
+
         # perform input checks to validate attributes
         self._input_checks()
 
@@ -191,11 +222,10 @@ class Logo:
 
         # create axes if not specified by user
         if self.ax is None:
-            fig, ax = plt.subplots(1, 1, figsize=self.figsize)
-            self.ax = ax
+            self.ax = _make_axes(self.figsize, self.use_pyplot)
 
         # save figure as attribute
-        self.fig = ax.figure
+        self.fig = self.ax.figure
 
         # compute characters
         self._compute_glyphs()
@@ -329,6 +359,16 @@ class Logo:
                    for n in self.figsize]),
               'all elements of figsize array must be numbers > 0.')
 
+        # validate that use_collection is boolean
+        check(isinstance(self.use_collection, bool),
+              'type(use_collection) = %s; must be of type bool ' %
+              type(self.use_collection))
+
+        # validate that use_pyplot is boolean
+        check(isinstance(self.use_pyplot, bool),
+              'type(use_pyplot) = %s; must be of type bool ' %
+              type(self.use_pyplot))
+
     @handle_errors
     def style_glyphs(self,
                      color_scheme=None,
@@ -374,15 +414,15 @@ class Logo:
             if key in kwargs.keys():
                 self.__dict__[key] = kwargs[key]
 
-        # modify all glyphs
-        for g in self.glyph_list:
+        # add colors to kwargs dict, but only if user is updating color
+        if color_scheme is not None:
+            kwargs['color'] = self._get_glyph_colors()
 
-            # add color to kwargs dict, but only if user is updating color
-            if color_scheme is not None:
-                kwargs['color'] = self.rgb_dict[g.c]
+        # modify all glyphs
+        self.glyph_table.set(slice(None), **kwargs)
 
-            # set each glyph attribute
-            g.set_attributes(**kwargs)
+        # update rendered glyphs
+        self._update_artists()
 
     @handle_errors
     def fade_glyphs_in_probability_logo(self,
@@ -431,24 +471,16 @@ class Logo:
         # make sure matrix is a probability matrix
         self.df = validate_matrix(self.df, matrix_type='probability')
 
-        # iterate over all positions and characters
-        for p in self.ps:
-            for c in self.cs:
-
-                # grab both glyph and value
-                v = self.df.loc[p, c]
-                g = self.glyph_df.loc[p, c]
+        # compute alpha of each glyph from matrix values, linearly ramping
+        # from 0 at v_alpha0 to 1 at v_alpha1
+        values = self.df.loc[self.ps, self.cs].values
+        alphas = np.clip((values - v_alpha0) / (v_alpha1 - v_alpha0), 0, 1)
 
-                # compute new alpha
-                if v <= v_alpha0:
-                    alpha = 0
-                elif v >= v_alpha1:
-                    alpha = 1
-                else:
-                    alpha = (v - v_alpha0) / (v_alpha1 - v_alpha0)
+        # set glyph attributes
+        self.glyph_table.set(self._glyph_rows.ravel(), alpha=alphas.ravel())
 
-                # Set glyph attributes
-                g.set_attributes(alpha=alpha)
+        # update rendered glyphs
+        self._update_artists()
 
     @handle_errors
     def style_glyphs_below(self,
@@ -529,34 +561,27 @@ class Logo:
                   'type(flip) = %s; must be of type bool ' %
                   type(flip))
 
-        # iterate over all positions and characters
-        for p in self.ps:
-            for c in self.cs:
-
-                # check if matrix value is < 0
-                v = self.df.loc[p, c]
-                if v < 0:
+        # only modify flip if specified
+        if flip is not None:
+            kwargs['flip'] = flip
 
-                    # get glyph
-                    g = self.glyph_df.loc[p, c]
+        # get rows of glyphs whose matrix values are < 0
+        table = self.glyph_table
+        values = self.df.loc[self.ps, self.cs].values
+        rows = self._glyph_rows[values < 0]
 
-                    # modify color
-                    if color is None:
-                        this_color = get_rgb(g.color)
-                    else:
-                        this_color = color
+        # get colors and alphas before shade and fade are applied
+        colors = table.color[rows] if color is None else np.array(color)
+        alphas = table.alpha[rows] if alpha is None else alpha
 
-                    # modify alpha
-                    if alpha is None:
-                        this_alpha = g.alpha
-                    else:
-                        this_alpha = alpha
+        # set glyph attributes
+        table.set(rows,
+                  color=colors*(1.0 - shade),
+                  alpha=alphas*(1.0 - fade),
+                  **kwargs)
 
-                    # set glyph attributes
-                    g.set_attributes(color=this_color*(1.0 - shade),
-                                     alpha=this_alpha*(1.0 - fade),
-                                     flip=flip,
-                                     **kwargs)
+        # update rendered glyphs
+        self._update_artists()
 
     @handle_errors
     def style_single_glyph(self, p, c, **kwargs):
@@ -587,7 +612,7 @@ class Logo:
               'type(p) = %s must be of type int or numpy.int64' % type(p))
 
         # check p is a valid position
-        check(p in self.glyph_df.index,
+        check(p in self.ps,
               'p=%s is not a valid position' % p)
 
         # validate c is a str
@@ -599,14 +624,94 @@ class Logo:
               'c = %s; must have length 1.' % repr(c))
 
         # check c is a valid character
-        check(c in self.glyph_df.columns,
+        check(c in self.cs,
               'c=%s is not a valid character' % c)
 
-        # Get glyph from glyph_df
-        g = self.glyph_df.loc[p, c]
+        # Get row of glyph in glyph_table
+        i = np.flatnonzero(self.ps == p)[0]
+        j = np.flatnonzero(self.cs == c)[0]
+        row = self._glyph_rows[i, j]
 
         # update glyph attributes
-        g.set_attributes(**kwargs)
+        self.glyph_table.set(row, **kwargs)
+
+        # update rendered glyph
+        self._update_artists()
+
+    @handle_errors
+    def style_glyphs_where(self, mask, **kwargs):
+        """
+        Modifies the properties of all characters selected by a mask, in a
+        single vectorized update.
+
+        parameters
+        ----------
+
+        mask: (array, pd.DataFrame, list, or function)
+            Specification of which glyphs to modify. Can take a variety of
+            forms.
+             - (np.ndarray) A boolean array of shape (L, C), with rows
+             corresponding to positions and columns corresponding to
+             characters, in the order of the matrix df passed to the Logo
+             constructor.
+             - (pd.DataFrame) A boolean dataframe whose index and columns
+             are positions and characters. Glyphs whose positions or
+             characters are missing from the dataframe are not modified.
+             - (list) A list of (p, c) tuples listing the positions and
+             characters of glyphs to modify.
+             - (function) A function that takes the matrix df as its only
+             argument and returns a boolean array or dataframe as above,
+             E.g., lambda df: df > 0.5
+
+        **kwargs:
+            Keyword arguments to pass to Glyph.set_attributes()
+
+        returns
+        -------
+        None
+        """
+
+        # evaluate function on matrix values
+        if callable(mask):
+            mask = mask(self.df)
+
+        # align dataframe with positions and characters of logo
+        if isinstance(mask, pd.DataFrame):
+            mask = mask.reindex(index=self.ps, columns=self.cs,
+                                fill_value=False).values
+
+        # convert a list of (p, c) tuples to a boolean array
+        elif isinstance(mask, list) and \
+                all(isinstance(pc, tuple) for pc in mask):
+            check(all(len(pc) == 2 for pc in mask),
+                  'each element of mask must be a (p, c) tuple')
+            ps = [pc[0] for pc in mask]
+            cs = [pc[1] for pc in mask]
+            i = pd.Index(self.ps).get_indexer(ps)
+            j = pd.Index(self.cs).get_indexer(cs)
+            check(np.all(i >= 0),
+                  'mask contains invalid positions %s' %
+                  [p for p, k in zip(ps, i) if k < 0])
+            check(np.all(j >= 0),
+                  'mask contains invalid characters %s' %
+                  [c for c, k in zip(cs, j) if k < 0])
+            mask = np.zeros([self.L, self.C], dtype=bool)
+            mask[i, j] = True
+
+        # validate mask
+        mask = np.asarray(mask)
+        check(mask.dtype == bool,
+              'mask must contain values of type bool; dtype is %s' %
+              mask.dtype)
+        check(mask.shape == (self.L, self.C),
+              'mask has shape %s; must have shape %s' %
+              (mask.shape, (self.L, self.C)))
+
+        # update attributes of selected glyphs
+        self.glyph_table.set(self._glyph_rows[mask], **kwargs)
+
+        # update rendered glyphs
+        self._update_artists()
 
     @handle_errors
     def style_glyphs_in_sequence(self,
@@ -639,16 +744,13 @@ class Logo:
               'sequence to restyle (length %d) ' % len(sequence) +
               'must have same length as logo (length %d).' % self.L)
 
-        # for each position in the logo...
-        for i, p in enumerate(self.glyph_df.index):
-
-            # get character to highlight
-            c = sequence[i]
+        # select, at each position, the glyph of the corresponding character
+        # in sequence. Characters not in self.cs select no glyph
+        mask = np.array(list(sequence), dtype=object)[:, np.newaxis] == \
+            np.asarray(self.cs, dtype=object)[np.newaxis, :]
 
-            # modify the glyph corresponding character c at position p.
-            # only modify if c is a valid character; if not, ignore position
-            if c in self.cs:
-                self.style_single_glyph(p, c, **kwargs)
+        # modify selected glyphs
+        self.style_glyphs_where(mask, **kwargs)
 
     @handle_errors
     def highlight_position(self, p, **kwargs):
@@ -799,6 +901,32 @@ class Logo:
         # add rectangle to Axes
         self.ax.add_patch(patch)
 
+    @contextmanager
+    def batch_update(self):
+        """
+        Context manager that batches changes to the Logo. Within the block,
+        styling methods such as style_glyphs(), style_single_glyph(), and
+        style_glyphs_below() only record changes to glyphs. Rendered glyphs,
+        and the data limits of ax, are updated once, when the block exits.
+        E.g.,
+
+            with logo.batch_update():
+                logo.style_glyphs(color_scheme='classic')
+                logo.style_glyphs_below(shade=.5)
+                logo.style_single_glyph(p=3, c='A', color='red')
+
+        returns
+        -------
+        None
+        """
+
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            self._update_artists()
+
     @handle_errors
     def draw_baseline(self,
                       zorder=-1,
@@ -1044,96 +1172,357 @@ class Logo:
         if clear:
             self.ax.clear()
 
-            # draw each glyph
-            for g in self.glyph_list:
-                g.draw()
+            # glyph collections were removed from ax, so must be rebuilt
+            if self.use_collection:
+                self._glyph_collections = None
+
+            # otherwise, draw each glyph
+            else:
+                for g in self._glyphs:
+                    if g is not None:
+                        g.draw()
+
+        # bring rendered glyphs up to date
+        self._update_artists()
 
         # draw baseline
         self.draw_baseline(linewidth=self.baseline_width)
 
         # set xlims
-        xmin = min([g.p - .5*g.width for g in self.glyph_list])
-        xmax = max([g.p + .5*g.width for g in self.glyph_list])
+        table = self.glyph_table
+        xmin = np.min(table.p - .5*table.width)
+        xmax = np.max(table.p + .5*table.width)
         self.ax.set_xlim([xmin, xmax])
 
         # set ylims
-        ymin = min([g.floor for g in self.glyph_list])
-        ymax = max([g.ceiling for g in self.glyph_list])
+        ymin = np.min(table.floor)
+        ymax = np.max(table.ceiling)
         self.ax.set_ylim([ymin, ymax])
 
         # style spines if requested
         if self.show_spines is not None:
             self.style_spines(visible=self.show_spines)
 
+    @handle_errors
+    def save_svg(self, fname):
+        """
+        Writes the glyphs of the logo directly to an SVG file, without using
+        matplotlib's SVG backend. Each distinct glyph outline is written only
+        once, and each glyph is written as a reference to its outline, which
+        keeps files small. Only glyphs are written; other content of ax, such
+        as the baseline, ticks, and spines, is not. The image spans the
+        current x and y limits of ax and has the size of ax.
+
+        parameters
+        ----------
+
+        fname: (str or file-like object)
+            Name of the file to write, or a file-like object opened in
+            text mode.
+
+        returns
+        -------
+        None
+        """
+
+        # validate fname
+        check(isinstance(fname, str) or hasattr(fname, 'write'),
+              'type(fname) = %s; must be a str or a file-like object' %
+              type(fname))
+
+        # get glyphs in the order they are drawn
+        table = self.glyph_table
+        rows = np.flatnonzero(table.height != 0)
+        order = np.argsort(self._get_glyph_zorders(rows), kind='mergesort')
+        rows = rows[order]
+
+        # get size of ax in points
+        bbox = self.ax.get_position()
+        fig_width, fig_height = self.fig.get_size_inches()
+        width = 72.0 * bbox.width * fig_width
+        height = 72.0 * bbox.height * fig_height
+
+        # create SVG
+        svg = glyphs_to_svg(table,
+                            rows,
+                            xlim=self.ax.get_xlim(),
+                            ylim=self.ax.get_ylim(),
+                            width=width,
+                            height=height)
+
+        # write SVG
+        if isinstance(fname, str):
+            with open(fname, 'w') as f:
+                f.write(svg)
+        else:
+            fname.write(svg)
+
+    def _compute_layout(self):
+        """
+        Computes the stacking order, floor, and ceiling of all glyphs in the
+        logo at once, using array operations over the (L, C) value matrix.
+
+        returns
+        -------
+        ordered_indices: (np.ndarray)
+            (L, C) array of column indices; row i lists the characters at
+            position self.ps[i] in the order in which they are stacked,
+            from bottom to top.
+
+        floors, ceilings: (np.ndarray)
+            (L, C) arrays listing the floor and ceiling of each glyph. Rows
+            and columns correspond to self.ps and self.cs.
+        """
+
+        # get values as an (L, C) array
+        vs = self.df.values.astype(float)
+        rows = np.arange(self.L)[:, np.newaxis]
+
+        # Sort values according to the order in which the user
+        # wishes the characters to be stacked
+        if self.stack_order == 'big_on_top':
+            ordered_indices = np.argsort(vs, axis=1)
+
+        elif self.stack_order == 'small_on_top':
+            tmp_vs = np.zeros(vs.shape)
+            indices = (vs != 0)
+            tmp_vs[indices] = 1.0/vs[indices]
+            ordered_indices = np.argsort(tmp_vs, axis=1)
+
+        elif self.stack_order == 'fixed':
+            ordered_indices = np.tile(np.arange(self.C)[::-1], (self.L, 1))
+
+        else:
+            assert False, 'This line of code should never be called.'
+
+        # Reorder values
+        ordered_vs = vs[rows, ordered_indices]
+
+        # Set floor of the bottom glyph at each position. Cumulative sums
+        # are used here and below so that values are added in exactly the
+        # same order as when glyphs are stacked one at a time.
+        below = (ordered_vs - self.vsep) * (ordered_vs < 0)
+        floor0 = np.cumsum(below, axis=1)[:, -1] + self.vsep/2.0
+
+        # Interleave glyph heights and vertical separations, starting from
+        # floor0, so that a running sum alternates between the ceiling of
+        # one glyph and the floor of the next
+        steps = np.empty((self.L, 2*self.C + 1))
+        steps[:, 0] = floor0
+        steps[:, 1::2] = np.abs(ordered_vs)
+        steps[:, 2::2] = self.vsep
+        stacked = np.cumsum(steps, axis=1)
+
+        # Place floors and ceilings back in the original column order
+        floors = np.empty(vs.shape)
+        ceilings = np.empty(vs.shape)
+        floors[rows, ordered_indices] = stacked[:, 0:-1:2]
+        ceilings[rows, ordered_indices] = stacked[:, 1::2]
+
+        return ordered_indices, floors, ceilings
+
     def _compute_glyphs(self):
         """
-        Specifies the placement and styling of all glyphs within the logo.
+        Specifies the placement and styling of all glyphs within the logo,
+        storing these in self.glyph_table.
         """
-        # Create a dataframe of glyphs
-        glyph_df = pd.DataFrame()
 
-        # For each position
-        for p in self.ps:
+        # Compute stacking order, floors, and ceilings of all glyphs
+        ordered_indices, floors, ceilings = self._compute_layout()
+
+        # Glyphs are stored position by position, in stacking order.
+        # Record the row of glyph_table that stores each (p, c) pair.
+        i_indices = np.repeat(np.arange(self.L), self.C)
+        j_indices = ordered_indices.ravel()
+        self._glyph_rows = np.empty((self.L, self.C), dtype=int)
+        self._glyph_rows[i_indices, j_indices] = np.arange(self.L*self.C)
+
+        # Set whether to flip each character
+        flips = (self.df.values < 0) & self.flip_below
+
+        # Create table of glyphs
+        self.glyph_table = GlyphTable(p=self.ps[i_indices],
+                                      c=self.cs[j_indices],
+                                      floor=floors[i_indices, j_indices],
+                                      ceiling=ceilings[i_indices, j_indices],
+                                      flip=flips[i_indices, j_indices],
+                                      zorder=self.zorder,
+                                      font_name=self.font_name,
+                                      alpha=self.alpha,
+                                      vpad=self.vpad,
+                                      **self.glyph_kwargs)
+        self.glyph_table.set(slice(None), color=self._get_glyph_colors())
+
+        # No Glyph objects have been created yet
+        self._glyphs = np.empty(len(self.glyph_table), dtype=object)
+        self._glyph_df = None
+
+    def _get_glyph_colors(self):
+        """
+        Returns an (N, 3) array listing the color of each glyph in
+        self.glyph_table according to self.rgb_dict.
+        """
+        table = self.glyph_table
+        char_colors = np.array([get_rgb(self.rgb_dict[c])
+                                for c in table.chars])
+        return char_colors[table.codes]
+
+    @property
+    def glyph_df(self):
+        """
+        pd.DataFrame of Glyph objects, with rows corresponding to positions
+        and columns corresponding to characters. Glyph objects are created
+        from glyph_table when first requested.
+        """
+        if self._glyph_df is None:
+            glyphs = self._get_glyphs(np.arange(len(self.glyph_table)))
+            self._glyph_df = pd.DataFrame(data=glyphs[self._glyph_rows],
+                                          index=self.ps,
+                                          columns=list(self.cs))
+        return self._glyph_df
+
+    @property
+    def glyph_list(self):
+        """
+        List of all Glyph objects in the logo, ordered by position and,
+        within each position, from the bottom of the stack to the top.
+        """
+        return list(self._get_glyphs(np.arange(len(self.glyph_table))))
 
-            # get values at this position
-            vs = np.array(self.df.loc[p, :])
+    def _get_glyphs(self, rows):
+        """
+        Returns an array of the Glyph objects stored in the specified rows
+        of glyph_table, creating Glyph objects as needed.
+        """
+
+        for row in rows:
+            if self._glyphs[row] is None:
 
-            # Sort values according to the order in which the user
-            # wishes the characters to be stacked
-            if self.stack_order == 'big_on_top':
-                ordered_indices = np.argsort(vs)
+                # create glyph
+                glyph = Glyph(ax=self.ax, **self.glyph_table.get(row))
 
-            elif self.stack_order == 'small_on_top':
-                tmp_vs = np.zeros(len(vs))
-                indices = (vs != 0)
-                tmp_vs[indices] = 1.0/vs[indices]
-                ordered_indices = np.argsort(tmp_vs)
+                # If rendering glyphs as collections, detach glyph from ax,
+                # and have glyph update collections when it is changed
+                if self.use_collection:
+                    glyph._detach()
+                    glyph._on_change = self._update_artists
 
-            elif self.stack_order == 'fixed':
-                ordered_indices = np.array(range(len(vs)))[::-1]
+                # link glyph to its row in glyph_table
+                glyph._table = self.glyph_table
+                glyph._row = row
+                self._glyphs[row] = glyph
 
+        return self._glyphs[rows]
+
+    def _update_artists(self):
+        """
+        Updates the matplotlib artists used to render glyphs that have
+        changed in glyph_table. Does nothing within a batch_update() block.
+        """
+
+        # defer updates until batch_update() block is exited
+        if self._batch_depth > 0:
+            return
+
+        # get rows that have changed, and which of these changed geometry
+        rows, geometry_changed = self.glyph_table.pop_dirty()
+
+        # build or update glyph collections if used
+        if self.use_collection:
+            if self._glyph_collections is None:
+                self._build_collections()
             else:
-                assert False, 'This line of code should never be called.'
-
-            # Reorder values and characters
-            vs = vs[ordered_indices]
-            cs = [str(c) for c in self.cs[ordered_indices]]
-
-            # Set floor
-            floor = sum((vs - self.vsep) * (vs < 0)) + self.vsep/2.0
-
-            # For each character
-            for v, c in zip(vs, cs):
-
-                # Set ceiling
-                ceiling = floor + abs(v)
-
-                # Set color
-                this_color = self.rgb_dict[c]
-
-                # Set whether to flip character
-                flip = (v < 0 and self.flip_below)
-
-                # Create glyph if height is finite
-                glyph = Glyph(p, c,
-                              ax=self.ax,
-                              floor=floor,
-                              ceiling=ceiling,
-                              color=this_color,
-                              flip=flip,
-                              zorder=self.zorder,
-                              font_name=self.font_name,
-                              alpha=self.alpha,
-                              vpad=self.vpad,
-                              **self.glyph_kwargs)
-
-                # Add glyph to glyph_df
-                glyph_df.loc[p, c] = glyph
-
-                # Raise floor to current ceiling
-                floor = ceiling + self.vsep
-
-        # Set glyph_df attribute
-        self.glyph_df = glyph_df
-        self.glyph_list = [g for g in self.glyph_df.values.ravel()
-                           if isinstance(g, Glyph)]
+                self._update_collections(rows, geometry_changed)
+
+        # update existing Glyph objects
+        table = self.glyph_table
+        exists = np.array([glyph is not None
+                           for glyph in self._glyphs[rows]], dtype=bool)
+        for row in rows[exists]:
+            self._glyphs[row]._set_attributes(**table.get(row))
+
+        # If not using collections, also create Glyph objects for all other
+        # glyphs that have nonzero height
+        if not self.use_collection:
+            heights = table.height
+            new_rows = rows[~exists]
+            self._get_glyphs(new_rows[heights[new_rows] != 0])
+
+    def _build_collections(self):
+        """
+        (Re)builds the GlyphCollections used to render glyphs when
+        use_collection is True. One GlyphCollection is created for each
+        distinct zorder value used by glyphs. Glyph paths are not computed
+        here, but only when the collections are drawn.
+        """
+
+        # remove existing collections from ax
+        if self._glyph_collections is not None:
+            for collection in self._glyph_collections.values():
+                if collection.axes is not None:
+                    collection.remove()
+
+        table = self.glyph_table
+
+        # record, for each glyph, the zorder of the collection storing it
+        # and its index within that collection; glyphs with zero height
+        # are not stored
+        rows = np.flatnonzero(table.height != 0)
+        zorders = self._get_glyph_zorders(rows)
+        self._slot_zorders = np.full(len(table), np.nan)
+        self._slot_indices = np.full(len(table), -1, dtype=int)
+        self._slot_zorders[rows] = zorders
+
+        # create one collection per zorder value and add it to ax. Data
+        # limits are set from glyph bounding boxes, so that paths are not
+        # computed by add_collection().
+        self._glyph_collections = {}
+        for zorder in np.unique(zorders):
+            members = rows[zorders == zorder]
+            self._slot_indices[members] = np.arange(len(members))
+            collection = GlyphCollection(table, members, zorder=zorder)
+            self.ax.add_collection(collection, autolim=False)
+            self.ax.update_datalim(table.get_datalim(members))
+            self._glyph_collections[zorder] = collection
+
+    def _update_collections(self, rows, geometry_changed):
+        """
+        Updates the entries of the specified glyph_table rows in the
+        GlyphCollections used to render glyphs, in place if possible.
+        Otherwise, all collections are rebuilt. Paths are recomputed only
+        for glyphs flagged in geometry_changed.
+        """
+
+        # nothing to do if nothing changed
+        if len(rows) == 0:
+            return
+
+        # If any glyph has changed zorder, or has changed between zero and
+        # nonzero height, rebuild all collections
+        table = self.glyph_table
+        visible = (table.height[rows] != 0)
+        stored = (self._slot_indices[rows] >= 0)
+        zorders = self._get_glyph_zorders(rows[visible])
+        if (not np.array_equal(visible, stored)) or \
+                (not np.array_equal(zorders,
+                                    self._slot_zorders[rows[visible]])):
+            self._build_collections()
+            return
+
+        # update the affected collections in place
+        rows = rows[visible]
+        geometry_changed = geometry_changed[visible]
+        for zorder in np.unique(zorders):
+            in_collection = (zorders == zorder)
+            members = rows[in_collection]
+            self._glyph_collections[zorder].update_glyphs(
+                self._slot_indices[members], geometry_changed[in_collection])
+            self.ax.update_datalim(table.get_datalim(members))
+
+    def _get_glyph_zorders(self, rows):
+        """
+        Returns the zorder with which each glyph is drawn. Glyphs with
+        unspecified zorder are drawn with the matplotlib default for patches.
+        """
+        zorders = self.glyph_table.zorder[rows]
+        return np.where(np.isnan(zorders), PathPatch.zorder, zorders)
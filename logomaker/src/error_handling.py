@@ -1,6 +1,16 @@
 from __future__ import division
+import os
 from functools import wraps
 
+# Environment variable that turns on production mode if set to '1', 'true',
+# 'yes', or 'on' when Logomaker is imported
+PRODUCTION_MODE_VARIABLE = 'LOGOMAKER_PRODUCTION_MODE'
+
+# Whether handle_errors returns functions undecorated. Is fixed when
+# Logomaker is imported, since functions are decorated at that time.
+PRODUCTION_MODE = os.environ.get(PRODUCTION_MODE_VARIABLE, '').strip().lower() \
+                  in ('1', 'true', 'yes', 'on')
+
 
 class LogomakerError(Exception):
     """
@@ -78,8 +88,17 @@ def handle_errors(func):
 
     with mistake flagging whether or not the function failed or succeeded
     as expected.
+
+    In production mode, i.e., if the environment variable
+    LOGOMAKER_PRODUCTION_MODE is set to '1', 'true', 'yes', or 'on' when
+    Logomaker is imported, func is returned undecorated, so that calls to
+    it incur no overhead, and should_fail cannot be passed.
     """
 
+    # In production mode, return func itself
+    if PRODUCTION_MODE:
+        return func
+
     @wraps(func)  # So wrapped_func has the same docstring, etc., as func
     def wrapped_func(*args, **kwargs):
 
@@ -93,66 +112,85 @@ def handle_errors(func):
         check(should_fail in (True, False, None),
               'FATAL: should_fail = %s is not bool or None' % should_fail)
 
-        # Default values for returned variables
-        result = None
-        mistake = None
+        # If not in debug mode, just execute function
+        if should_fail is None:
+            return func(*args, **kwargs)
+
+        # Otherwise, execute function and record whether or not it failed
+        # or succeeded as expected
+        result, mistake = call_with_should_fail(func, should_fail,
+                                                *args, **kwargs)
+
+        # If func is a constructor,
+        # extract self from args[0],
+        # and set mistake attribute
+        if func.__name__ == "__init__":
+            args[0].mistake = mistake
+            return None
+
+        # Otherwise, return result and mistake status as attributes
+        # of container class object
+        else:
+            return DebugResult(result, mistake)
 
-        try:
-            # Execute function
-            result = func(*args, **kwargs)
+    # Return the wrapped function to the user
+    return wrapped_func
 
-            # If running functional test and expect to fail
-            if should_fail is True:
-                print('UNEXPECTED SUCCESS.')
-                mistake = True
 
-            # If running functional test and expect to pass
-            elif should_fail is False:
-                print('Expected success.')
-                mistake = False
+def call_with_should_fail(func, should_fail, *args, **kwargs):
+    """
+    Calls func and records whether it failed or succeeded as expected. This
+    implements the should_fail protocol of handle_errors, and is also used
+    by the functional tests to call functions left undecorated in
+    production mode.
 
-            # If user did not pass should_fail then nothing more to do.
-            else:
-                pass
+    parameters
+    ----------
 
-        except LogomakerError as e:
+    func: (function or class constructor)
+        The function to call with *args and **kwargs.
 
-            # If running functional test and expect to fail
-            if should_fail is True:
-                print('Expected error:',
-                      e.__str__())
-                mistake = False
+    should_fail: (bool)
+        Whether func is expected to raise a LogomakerError.
 
-            # If running functional test and expect to pass
-            elif should_fail is False:
-                print('UNEXPECTED ERROR:',
-                      e.__str__())
-                mistake = True
+    returns
+    -------
+    result: (object)
+        The value returned by func, or None if func raised a LogomakerError.
 
-            # Otherwise, raise error
-            else:
-                raise e
+    mistake: (bool)
+        Whether func failed or succeeded unexpectedly.
+    """
 
-        # If not in debug mode, and no error was detected above,
-        if should_fail is None:
+    # Default value for returned result
+    result = None
 
-            # Just return result
-            return result
+    try:
+        # Execute function
+        result = func(*args, **kwargs)
 
-        # Otherwise, if in debug mode
+        # If expect to fail
+        if should_fail:
+            print('UNEXPECTED SUCCESS.')
+            mistake = True
+
+        # If expect to pass
         else:
+            print('Expected success.')
+            mistake = False
 
-            # If func is a constructor,
-            # extract self from args[0],
-            # and set mistake attribute
-            if func.__name__ == "__init__":
-                args[0].mistake = mistake
-                return None
+    except LogomakerError as e:
 
-            # Otherwise, return result and mistake status as attributes
-            # of container class object
-            else:
-                return DebugResult(result, mistake)
+        # If expect to fail
+        if should_fail:
+            print('Expected error:',
+                  e.__str__())
+            mistake = False
 
-    # Return the wrapped function to the user
-    return wrapped_func
\ No newline at end of file
+        # If expect to pass
+        else:
+            print('UNEXPECTED ERROR:',
+                  e.__str__())
+            mistake = True
+
+    return result, mistake
@@ -1,10 +1,17 @@
 from __future__ import division
+import os
+import gzip
+from itertools import islice
+from collections import deque, Counter, OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
 
 # Logomaker imports
 from logomaker.src.error_handling import check, handle_errors
-from logomaker.src.validate import validate_matrix
+from logomaker.src.validate import validate_matrix, _mark_validated, \
+    _is_full_validation
 
 # Specifies built-in character alphabets
 ALPHABET_DICT = {
@@ -36,6 +43,17 @@ IUPAC_DICT = {
 SMALL = np.finfo(float).tiny
 MATRIX_TYPES = {'counts', 'probability', 'weight', 'information'}
 
+# Number of sequences counted at a time by CountsAccumulator.add()
+SEQUENCE_CHUNK_SIZE = 2**16
+
+# Separator with which chunks of sequences are joined into a single string
+# for counting; sequences must not contain it
+SEQUENCE_SEPARATOR = '\n'
+
+# Approximate number of array elements counted at a time by
+# CountsAccumulator.add_encoded()
+ENCODED_CHUNK_SIZE = 2**22
+
 
 @handle_errors
 def transform_matrix(df,
@@ -134,6 +152,326 @@ def transform_matrix(df,
     # validate matrix dataframe
     df = validate_matrix(df)
 
+    # validate transformation options
+    _check_transform_options(center_values, normalize_values,
+                             from_type, to_type)
+
+    # validate background
+    check(isinstance(background, (type([]), np.ndarray, pd.DataFrame)) or
+          (background is None),
+          'type(background) = %s must be None or array-like or a dataframe.' %
+          type(background))
+
+    # validate pseudocount
+    check(isinstance(pseudocount, (int, float)),
+          'type(pseudocount) = %s must be a number' % type(pseudocount))
+    check(pseudocount >= 0,
+          'pseudocount=%s must be >= 0' % pseudocount)
+
+    # if to_type == from_type, just return matrix
+    # Note, this is the only way that to_type='counts' is valid
+    if (not center_values) and (not normalize_values) and \
+            from_type == to_type:
+        return df
+
+    # Get background probabilities, but only if they are used
+    if _uses_background(center_values, normalize_values, from_type, to_type):
+        bg_values = _get_background_values(df, background)
+    else:
+        bg_values = None
+
+    # Transform matrix values
+    values = _transform_values(df.values.astype(float),
+                               center_values=center_values,
+                               normalize_values=normalize_values,
+                               from_type=from_type,
+                               to_type=to_type,
+                               bg_values=bg_values,
+                               pseudocount=pseudocount)
+
+    # make sure all transformed values are finite numbers
+    if _is_full_validation():
+        check(np.isfinite(values).all(),
+              'some elements of the transformed matrix are not finite.')
+
+    # Return transformed matrix, which has the same rows and columns as df
+    # and so is also valid; normalized matrices are valid probability
+    # matrices
+    out_df = pd.DataFrame(data=values, index=df.index, columns=df.columns)
+    if normalize_values or to_type == 'probability':
+        _mark_validated(out_df, matrix_type='probability')
+    else:
+        _mark_validated(out_df)
+    return out_df
+
+
+@handle_errors
+def batch_transform_matrix(matrices,
+                           center_values=False,
+                           normalize_values=False,
+                           from_type=None,
+                           to_type=None,
+                           background=None,
+                           pseudocount=1,
+                           lengths=None):
+    """
+    Performs the same transformation as transform_matrix() on many matrices
+    at once. All matrices must have the same characters, but can differ in
+    length. Rows of all matrices are transformed together using a few
+    NumPy operations, which is much faster than calling transform_matrix()
+    once for each matrix.
+
+    parameters
+    ----------
+
+    matrices: (np.ndarray, or list of dataframes or np.ndarrays)
+        The matrices to be transformed. Either an (M, L, C) array of M
+        matrices of the same length L, a list of M dataframes with the same
+        columns, or a list of M (L_m, C) arrays.
+
+    center_values: (bool)
+        Whether to center matrix values, i.e., subtract the mean from each
+        row.
+
+    normalize_values: (bool)
+        Whether to normalize each row, i.e., divide each row by
+        the sum of that row.
+
+    from_type: (str)
+        Type of input matrices. Must be one of 'counts', 'probability',
+        'weight', or 'information'.
+
+    to_type: (str)
+        Type of output matrices. Must be one of 'probability', 'weight', or
+        'information'. Can be 'counts' ONLY if from_type is 'counts' too.
+
+    background: (None or array)
+        Specification of background probabilities. If a vector of length C,
+        it is used for all matrices. If an (M, C) array, each row is used
+        for the corresponding matrix. If matrices is an (M, L, C) array,
+        background can also be an array of the same shape, specifying the
+        background of each position of each matrix. Characters of
+        dataframes are in sorted order.
+
+    pseudocount: (number >= 0, or array)
+        Pseudocount to use when transforming from counts matrices to
+        probability matrices. Either a single number, or an array of M
+        numbers, one for each matrix.
+
+    lengths: (None or array of ints)
+        Only used if matrices is an (M, L, C) array, in which matrices are
+        padded to a common length L. If not None, an array of M numbers
+        specifying the actual length of each matrix; only the first
+        lengths[m] rows of matrix m are transformed, and the remaining rows
+        of the returned matrix are zero.
+
+    returns
+    -------
+    out_matrices: (np.ndarray, or list of dataframes or np.ndarrays)
+        Transformed matrices, of the same type and shape as matrices.
+    """
+
+    # validate transformation options
+    _check_transform_options(center_values, normalize_values,
+                             from_type, to_type)
+
+    # get values of all rows of all matrices, as an (R, C) array, and the
+    # index of the matrix to which each row belongs
+    values, row_matrices, lengths, cols = _get_batch_rows(matrices, lengths)
+    num_matrices = len(lengths)
+    num_cols = values.shape[1]
+
+    # validate background
+    check(isinstance(background, (list, np.ndarray)) or (background is None),
+          'type(background) = %s must be None or array-like.' %
+          type(background))
+
+    # get background probabilities of each row, but only if they are used
+    bg_values = None
+    if background is not None and \
+            _uses_background(center_values, normalize_values,
+                             from_type, to_type):
+        background = np.array(background)
+        check(np.issubdtype(background.dtype, np.number),
+              'background must contain only numbers.')
+
+        # background for all matrices
+        if background.ndim == 1:
+            check(len(background) == num_cols,
+                  'len(background) = %d; must be %d, the number of '
+                  'characters.' % (len(background), num_cols))
+            bg_values = background[np.newaxis, :]
+
+        # background for each matrix
+        elif background.ndim == 2:
+            check(background.shape == (num_matrices, num_cols),
+                  'background.shape = %s; must be %s.' %
+                  (background.shape, (num_matrices, num_cols)))
+            bg_values = background[row_matrices]
+
+        # background for each position of each matrix
+        else:
+            check(isinstance(matrices, np.ndarray) and
+                  background.shape == matrices.shape,
+                  'background.shape = %s; must be (C,), (M, C), or, if '
+                  'matrices is an array, the shape of matrices.' %
+                  (background.shape,))
+            bg_values = _get_padded_rows(background, lengths)
+
+        bg_values = _normalize_values(bg_values.astype(float))
+
+    # validate pseudocount
+    check(isinstance(pseudocount, (int, float, list, np.ndarray)) and
+          not isinstance(pseudocount, bool),
+          'type(pseudocount) = %s must be a number or array of numbers' %
+          type(pseudocount))
+    pseudocount = np.array(pseudocount)
+    check(np.issubdtype(pseudocount.dtype, np.number),
+          'pseudocount must contain only numbers.')
+    check(pseudocount.ndim == 0 or pseudocount.shape == (num_matrices,),
+          'pseudocount.shape = %s; must be a single number or an array of '
+          'length %d.' % (pseudocount.shape, num_matrices))
+    check(np.all(pseudocount >= 0), 'pseudocount must be >= 0')
+    if pseudocount.ndim == 1:
+        pseudocount = pseudocount[row_matrices][:, np.newaxis]
+
+    # Transform values of all rows
+    values = _transform_values(values,
+                               center_values=center_values,
+                               normalize_values=normalize_values,
+                               from_type=from_type,
+                               to_type=to_type,
+                               bg_values=bg_values,
+                               pseudocount=pseudocount)
+
+    # make sure all transformed values are finite numbers
+    if _is_full_validation():
+        check(np.isfinite(values).all(),
+              'some elements of the transformed matrices are not finite.')
+
+    # Return transformed matrices in the same form as matrices
+    if isinstance(matrices, np.ndarray):
+        out_matrices = np.zeros(matrices.shape)
+        out_matrices[np.arange(matrices.shape[1]) < lengths[:, np.newaxis]] \
+            = values
+    else:
+        out_matrices = np.split(values, np.cumsum(lengths)[:-1])
+        if cols is not None:
+            out_matrices = [pd.DataFrame(data=out_values,
+                                         index=df.index.rename('pos'),
+                                         columns=cols)
+                            for out_values, df in zip(out_matrices, matrices)]
+            for out_df in out_matrices:
+                _mark_validated(out_df)
+    return out_matrices
+
+
+def _get_batch_rows(matrices, lengths=None):
+    """
+    Validates the matrices passed to batch_transform_matrix(), and returns
+    the values of all their rows as a single (R, C) array, the index of the
+    matrix to which each row belongs, the length of each matrix, and, if
+    matrices are dataframes, their (sorted) columns.
+    """
+
+    cols = None
+
+    # get rows of an (M, L, C) array, possibly padded
+    if isinstance(matrices, np.ndarray):
+        check(matrices.ndim == 3,
+              'matrices.ndim = %d; an array of matrices must have 3 '
+              'dimensions.' % matrices.ndim)
+        num_matrices, L, _ = matrices.shape
+
+        # validate lengths
+        if lengths is None:
+            lengths = np.full(num_matrices, L)
+        else:
+            check(isinstance(lengths, (list, np.ndarray)),
+                  'type(lengths) = %s; must be None or array-like.' %
+                  type(lengths))
+            lengths = np.array(lengths)
+            check(np.issubdtype(lengths.dtype, np.integer) and
+                  lengths.shape == (num_matrices,),
+                  'lengths must be an array of %d integers.' % num_matrices)
+            check(np.all((lengths >= 1) & (lengths <= L)),
+                  'all lengths must be between 1 and %d.' % L)
+        values = _get_padded_rows(matrices, lengths)
+
+    # get rows of a list of matrices
+    else:
+        check(isinstance(matrices, (list, tuple)),
+              'type(matrices) = %s; must be an np.ndarray, or a list of '
+              'dataframes or np.ndarrays.' % type(matrices))
+        check(len(matrices) > 0, 'matrices must not be empty.')
+        check(lengths is None,
+              'lengths can only be specified if matrices is an np.ndarray.')
+
+        # get values of dataframes, with columns in the same sorted order
+        if all(isinstance(df, pd.DataFrame) for df in matrices):
+            cols = validate_matrix(matrices[0]).columns
+            value_list = []
+            for m, df in enumerate(matrices):
+                check(len(df.columns) == len(cols) and
+                      set(df.columns) == set(cols),
+                      'matrices[%d] has columns %s; must have columns %s.' %
+                      (m, list(df.columns), list(cols)))
+                check(len(df) > 0, 'matrices[%d] has zero rows.' % m)
+                if _is_full_validation():
+                    check(pd.api.types.is_integer_dtype(df.index) and
+                          df.index.is_unique,
+                          'matrices[%d] must have unique integer positions '
+                          'as its index.' % m)
+                if df.columns.equals(cols):
+                    value_list.append(df.values)
+                else:
+                    value_list.append(
+                        df.values[:, df.columns.get_indexer(cols)])
+
+        # otherwise, get values of arrays
+        else:
+            check(all(isinstance(x, np.ndarray) and x.ndim == 2
+                      for x in matrices),
+                  'matrices must be all dataframes or all 2D np.ndarrays.')
+            num_cols = matrices[0].shape[1]
+            check(all(x.shape[0] > 0 and x.shape[1] == num_cols
+                      for x in matrices),
+                  'all matrices must have at least one row and the same '
+                  'number of columns.')
+            value_list = matrices
+
+        lengths = np.array([len(x) for x in value_list])
+        values = np.concatenate(value_list)
+
+    # make sure values are finite numbers
+    check(np.issubdtype(values.dtype, np.number),
+          'matrices must contain only numbers.')
+    check(values.shape[1] > 0, 'matrices must have at least one column.')
+    if _is_full_validation():
+        check(np.isfinite(values).all(),
+              'some matrix elements are not finite.')
+
+    row_matrices = np.repeat(np.arange(len(lengths)), lengths)
+    return values.astype(float), row_matrices, lengths, cols
+
+
+def _get_padded_rows(array, lengths):
+    """
+    Returns the first lengths[m] rows of each matrix m in an (M, L, C)
+    array, as a single (R, C) array.
+    """
+    return array[np.arange(array.shape[1]) < lengths[:, np.newaxis]]
+
+
+def _check_transform_options(center_values,
+                             normalize_values,
+                             from_type,
+                             to_type):
+    """
+    Validates the options of transform_matrix() that specify which
+    transformation to perform.
+    """
+
     # validate center_values
     check(isinstance(center_values, bool),
           'type(center_values) = %s must be of type bool' %
@@ -154,45 +492,22 @@ def transform_matrix(df,
           'to_type = %s must be None or in %s' %
           (to_type, MATRIX_TYPES))
 
-    # validate background
-    check(isinstance(background, (type([]), np.ndarray, pd.DataFrame)) or
-          (background is None),
-          'type(background) = %s must be None or array-like or a dataframe.' %
-          type(background))
-
-    # validate pseudocount
-    check(isinstance(pseudocount, (int, float)),
-          'type(pseudocount) = %s must be a number' % type(pseudocount))
-    check(pseudocount >= 0,
-          'pseudocount=%s must be >= 0' % pseudocount)
-
-    # If centering values, do that
+    # If centering or normalizing values, make sure from_type and to_type
+    # are not specified
     if center_values is True:
         check((from_type is None) and (to_type is None),
               "If center_values is True, both from_type and to_type"
               "must be None. Here, from_type=%s, to_type=%s" %
               (from_type, to_type))
-
-        # Do centering
-        out_df = _center_matrix(df)
-
-    # Otherwise, if normalizing values, do that
     elif normalize_values is True:
         check((from_type is None) and (to_type is None),
               "If normalize_values is True, both from_type and to_type"
               "must be None. Here, from_type=%s, to_type=%s" %
               (from_type, to_type))
 
-        # Do centering
-        out_df = _normalize_matrix(df)
-
-    # otherwise, if to_type == from_type, just return matrix
-    # Note, this is the only way that to_type='counts' is valid
-    elif from_type == to_type:
-        out_df = df.copy()
-
-    # Otherwise, we're converting from one type of matrix to another. Do this.
-    else:
+    # If converting from one type of matrix to another, make sure the
+    # conversion is valid
+    elif from_type != to_type:
         # Check that from_type and to_type are not None
         check((from_type is not None) and (to_type is not None),
               'Unless center_values is True or normalize_values is True,'
@@ -204,263 +519,225 @@ def transform_matrix(df,
                                    "from_type='counts'. Here, however, "
                                    "from_type='%s'" % from_type)
 
-        # If converting from a probability matrix
-        if from_type == 'probability':
-
-            # ... to a weight matrix
-            if to_type == 'weight':
-                out_df = _probability_mat_to_weight_mat(df, background)
-
-            # ... to an information matrix
-            elif to_type == 'information':
-                out_df = _probability_mat_to_information_mat(df, background)
-
-            # This should never execute
-            else:
-                assert False, 'THIS SHOULD NEVER EXECUTE'
-
-        # Otherwise, convert to probability matrix, then call function again
-        else:
-
-            # If converting from a counts matrix,
-            # convert to probability matrix first
-            if from_type == 'counts':
-                prob_df = _counts_mat_to_probability_mat(df, pseudocount)
-
-            # If converting from a weight matrix,
-            # convert to probability matrix first
-            elif from_type == 'weight':
-                prob_df = _weight_mat_to_probability_mat(df, background)
 
-            # If converting from an information matrix,
-            # convert to probability matrix first
-            elif from_type == 'information':
-                prob_df = _information_mat_to_probability_mat(df, background)
+def _uses_background(center_values, normalize_values, from_type, to_type):
+    """
+    Returns True if the specified transformation uses background
+    probabilities.
+    """
+    return (not center_values) and (not normalize_values) and \
+        from_type != to_type and \
+        len({from_type, to_type} & {'weight', 'information'}) > 0
+
+
+def _transform_values(values,
+                      center_values=False,
+                      normalize_values=False,
+                      from_type=None,
+                      to_type=None,
+                      bg_values=None,
+                      pseudocount=1):
+    """
+    Performs the transformations of transform_matrix() on an array of
+    matrix values, with characters along the last axis. Arguments have
+    the same meaning as for transform_matrix(), and must already be
+    validated, except that bg_values is None (uniform background) or an
+    array of background probabilities that can be broadcast against values.
+    Works on (L, C) arrays, as well as on stacks of matrices of any shape
+    (..., L, C). Returns a new array.
+    """
 
-            # This should never execute
-            else:
-                assert False, 'THIS SHOULD NEVER EXECUTE'
+    # If centering values, do that
+    if center_values:
+        return _center_values(values)
 
-            # Now that we have the probability matrix,
-            # onvert to user-specified to_type
-            out_df = transform_matrix(prob_df,
-                                      from_type='probability',
-                                      to_type=to_type,
-                                      background=background)
+    # Otherwise, if normalizing values, do that
+    elif normalize_values:
+        return _normalize_values(values)
 
-    # Validate and return
-    out_df = validate_matrix(out_df)
-    return out_df
+    # otherwise, if to_type == from_type, just return values
+    elif from_type == to_type:
+        return values.copy()
+
+    # Use uniform background if background is not specified
+    if bg_values is None:
+        bg_values = 1 / values.shape[-1]
+
+    # Convert to probability matrix
+    if from_type == 'counts':
+        prob_values = _counts_to_probability_values(values, pseudocount)
+    elif from_type == 'probability':
+        prob_values = _check_probability_values(values)
+    elif from_type == 'weight':
+        prob_values = _weight_to_probability_values(values, bg_values)
+    elif from_type == 'information':
+        prob_values = _information_to_probability_values(values, bg_values)
+    else:
+        assert False, 'THIS SHOULD NEVER EXECUTE'
+
+    # Convert probability matrix to to_type
+    if to_type == 'probability':
+        return prob_values
+    elif to_type == 'weight':
+        return _probability_to_weight_values(prob_values, bg_values)
+    elif to_type == 'information':
+        return _probability_to_information_values(prob_values, bg_values)
+    else:
+        assert False, 'THIS SHOULD NEVER EXECUTE'
 
 
-def _counts_mat_to_probability_mat(counts_df, pseudocount=1.0):
+def _counts_to_probability_values(counts_values, pseudocount=1.0):
     """
-    Converts a counts matrix to a probability matrix
+    Converts counts matrix values to probability matrix values
     """
-
-    # Validate matrix before use
-    counts_df = validate_matrix(counts_df)
-
-    # Check pseudocount value
-    check(pseudocount >= 0, "pseudocount must be >= 0.")
-
-    # Compute prob_df
-    prob_df = counts_df.copy()
-    vals = counts_df.values + pseudocount
-    prob_df.loc[:, :] = vals / vals.sum(axis=1)[:, np.newaxis]
-    prob_df = _normalize_matrix(prob_df)
-
-    # Validate and return
-    prob_df = validate_matrix(prob_df, matrix_type='probability')
-    return prob_df
+    return _normalize_values(counts_values + pseudocount)
 
 
-def _probability_mat_to_weight_mat(prob_df, background=None):
+def _check_probability_values(prob_values):
     """
-    Converts a probability matrix to a weight matrix
+    Checks that values are valid probability matrix values, renormalizing
+    rows if they do not sum to one. Values are only checked if the
+    validation level is 'full', but are renormalized at all levels.
     """
 
-    # Validate matrix before use
-    prob_df = validate_matrix(prob_df, matrix_type='probability')
+    # check to see if values sum to one
+    sums = prob_values.sum(axis=-1, keepdims=True)
 
-    # Get background matrix
-    bg_df = _get_background_mat(prob_df, background)
+    if _is_full_validation():
 
-    # Compute weight_df; SMALL is a regularization factor to make sure
-    # np.log2 doesn't throw an error.
-    weight_df = prob_df.copy()
-    weight_df.loc[:, :] = np.log2(prob_df + SMALL) - np.log2(bg_df + SMALL)
+        # make sure all values are non-negative
+        check(np.all(prob_values >= 0), 'not all values in df are >=0.')
 
-    # Validate and return
-    weight_df = validate_matrix(weight_df)
-    return weight_df
+        # if any sums are close to zero, abort
+        check(not np.any(np.isclose(sums, 0.0)),
+              'some columns in df sum to nearly zero.')
 
+    # if any sums are not close to one, renormalize all sums
+    if not np.all(np.isclose(sums, 1.0)):
+        print('in validate_matrix(): Row sums in df are not close to 1. '
+              'Reormalizing rows...')
+        prob_values = prob_values / sums
 
-def _weight_mat_to_probability_mat(weight_df, background=None):
+    return prob_values
+
+
+def _probability_to_weight_values(prob_values, bg_values):
     """
-    Converts a weight matrix to a probability matrix
+    Converts probability matrix values to weight matrix values
     """
 
-    # Validate matrix before use
-    weight_df = validate_matrix(weight_df)
+    # SMALL is a regularization factor to make sure np.log2 doesn't throw
+    # an error.
+    return np.log2(prob_values + SMALL) - np.log2(bg_values + SMALL)
 
-    # Get background matrix
-    bg_df = _get_background_mat(weight_df, background)
 
-    # Compute prob_df
-    prob_df = weight_df.copy()
-    prob_df.loc[:, :] = bg_df.values * np.power(2, weight_df.values)
+def _weight_to_probability_values(weight_values, bg_values):
+    """
+    Converts weight matrix values to probability matrix values
+    """
 
     # Normalize matrix. Needed if matrix is centered.
-    prob_df = _normalize_matrix(prob_df)
-
-    # Validate and return
-    prob_df = validate_matrix(prob_df, matrix_type='probability')
-    return prob_df
+    return _normalize_values(bg_values * np.power(2, weight_values))
 
 
-def _probability_mat_to_information_mat(prob_df, background=None):
+def _probability_to_information_values(prob_values, bg_values):
     """
-    Converts a probability matrix to an information matrix
+    Converts probability matrix values to information matrix values
     """
+    tmp_values = prob_values * (np.log2(prob_values + SMALL) -
+                                np.log2(bg_values + SMALL))
+    info_vec = tmp_values.sum(axis=-1, keepdims=True)
+    return prob_values * info_vec
 
-    # Validate matrix before use
-    prob_df = validate_matrix(prob_df, matrix_type='probability')
-
-    # Get background matrix
-    bg_df = _get_background_mat(prob_df, background)
 
-    # Compute info_df
-    info_df = prob_df.copy()
-    fg_vals = prob_df.values
-    bg_vals = bg_df.values
-    tmp_vals = fg_vals * (np.log2(fg_vals + SMALL) - np.log2(bg_vals + SMALL))
-    info_vec = tmp_vals.sum(axis=1)
-    info_df.loc[:, :] = fg_vals * info_vec[:, np.newaxis]
-
-    # Validate and return
-    info_df = validate_matrix(info_df, matrix_type='information')
-    return info_df
-
-
-def _information_mat_to_probability_mat(info_df, background=None):
+def _information_to_probability_values(info_values, bg_values):
     """
-    Converts an information matrix to an probability matrix
+    Converts information matrix values to probability matrix values
     """
 
-    # Validate matrix before use
-    info_df = validate_matrix(info_df, matrix_type='information')
-
-    # Get background matrix
-    bg_df = _get_background_mat(info_df, background)
+    # make sure all elements are nonnegative
+    if _is_full_validation():
+        check(np.all(info_values >= 0), 'not all values in df are >=0.')
 
-    # This is a little subtle. If any rows of info_df are zero,
-    # _normalize_matrix() cannot be relied on. But in this case,
-    # we know that the corresponding row of prob_df should just
+    # This is a little subtle. If any rows of info_values are zero,
+    # _normalize_values() cannot be relied on. But in this case,
+    # we know that the corresponding row of prob_values should just
     # reflect background. So we replace rows that are zero with the
-    # corresponding bg_df row.
-    zero_indices = np.isclose(info_df.sum(axis=1), 0.0)
-    info_df.loc[zero_indices, :] = bg_df.loc[zero_indices, :]
+    # corresponding background row.
+    zero_rows = np.isclose(info_values.sum(axis=-1, keepdims=True), 0.0)
+    info_values = np.where(zero_rows,
+                           np.broadcast_to(bg_values, info_values.shape),
+                           info_values)
 
     # Just need to normalize matrix
-    prob_df = _normalize_matrix(info_df)
+    return _normalize_values(info_values)
 
-    # Validate and return
-    prob_df = validate_matrix(prob_df, matrix_type='probability')
-    return prob_df
 
-
-def _normalize_matrix(df):
+def _normalize_values(values):
     """
-    Normalizes a matrix df to a probability matrix prob_df
+    Normalizes matrix values to probability matrix values
     """
 
-    # Validate matrix
-    df = validate_matrix(df)
-
-    # Make sure all df values are greater than or equal to zero
-    check(all(df.values.ravel() >= 0),
-          'Some data frame entries are negative.')
+    # Make sure all values are greater than or equal to zero
+    sums = values.sum(axis=-1, keepdims=True)
+    if _is_full_validation():
+        check(np.all(values >= 0), 'Some data frame entries are negative.')
 
-    # Check to see if values sum to one
-    sums = df.sum(axis=1).values
+        # If any sums are close to zero, abort
+        check(not np.any(np.isclose(sums, 0.0)),
+              'Some columns in df sum to nearly zero.')
 
-    # If any sums are close to zero, abort
-    check(not any(np.isclose(sums, 0.0)),
-          'Some columns in df sum to nearly zero.')
+    return values / sums
 
-    # Create normalized version of input matrix
-    prob_df = df.copy()
-    prob_df.loc[:, :] = df.values / sums[:, np.newaxis]
 
-    # Validate and return probability matrix
-    prob_df = validate_matrix(prob_df, matrix_type='probability')
-    return prob_df
-
-
-def _center_matrix(df):
+def _center_values(values):
     """
-    Centers each row of a matrix about zero by subtracting out the mean.
+    Centers each row of matrix values about zero by subtracting out the mean.
     """
+    return values - values.mean(axis=-1, keepdims=True)
 
-    # Validate matrix
-    df = validate_matrix(df)
-
-    # Compute mean value of each row
-    means = df.mean(axis=1).values
-
-    # Subtract out means
-    out_df = df.copy()
-    out_df.loc[:, :] = df.values - means[:, np.newaxis]
 
-    # Validate and return
-    out_df = validate_matrix(out_df)
-    return out_df
-
-
-def _get_background_mat(df, background):
+def _get_background_values(df, background):
     """
-    Creates a background matrix given a background specification. There
-    are three possiblities:
-
-    1. background is None => out_df represents a uniform background
-    2. background is a vector => this vector is normalized then used as
-        the entries of the rows of out_df. Vector must be the same length
-        as the number of columns in df
-    3. background is a dataframe => it is then normalized and use as out_df.
-        In this case, background must have the same rows and cols as df
+    Returns the background probabilities given a background specification,
+    as an array that can be broadcast against the values of df. There are
+    three possiblities:
+
+    1. background is None => returns None, representing a uniform background
+    2. background is a vector => this vector is normalized then returned
+        as a single row. Vector must be the same length as the number of
+        columns in df
+    3. background is a dataframe => it is then normalized and its values
+        returned. In this case, background must have the same rows and cols
+        as df
     """
 
     # Get dimensions of df
     num_pos, num_cols = df.shape
 
-    # Create background using df as template
-    bg_df = df.copy()
-
     # If background is not specified, use uniform background
     if background is None:
-        bg_df.loc[:, :] = 1 / num_cols
+        return None
 
     # If background is array-like
     elif isinstance(background, (np.ndarray, list, tuple)):
         background = np.array(background)
-        check(len(background) == num_cols,
+        check(background.ndim == 1 and len(background) == num_cols,
               'df and background have mismatched dimensions.')
-        bg_df.loc[:, :] = background[np.newaxis, :]
-        bg_df = _normalize_matrix(bg_df)
+        check(np.issubdtype(background.dtype, np.number),
+              'background must contain only numbers.')
+        return _normalize_values(background[np.newaxis, :].astype(float))
 
     # If background is a dataframe
     elif isinstance(background, pd.core.frame.DataFrame):
         bg_df = validate_matrix(background)
-        check(all(df.index == bg_df.index),
+        check(len(df.index) == len(bg_df.index) and
+              all(df.index == bg_df.index),
               'Error: df and bg_mat have different indexes.')
-        check(all(df.columns == bg_df.columns),
+        check(len(df.columns) == len(bg_df.columns) and
+              all(df.columns == bg_df.columns),
               'Error: df and bg_mat have different columns.')
-        bg_df = _normalize_matrix(bg_df)
-
-    # validate as probability matrix
-    bg_df = validate_matrix(bg_df, matrix_type='probability')
-    return bg_df
+        return _normalize_values(bg_df.values.astype(float))
 
 
 @handle_errors
@@ -470,14 +747,20 @@ def alignment_to_matrix(sequences,
                         background=None,
                         characters_to_ignore='.-',
                         center_weights=False,
-                        pseudocount=1.0):
+                        pseudocount=1.0,
+                        n_jobs=1,
+                        collapse_duplicates=False):
     """
     Generates matrix from a sequence alignment
 
     parameters
     ----------
-    sequences: (list of strings)
-        A list of sequences, all of which must be the same length
+    sequences: (list of strings, iterator, or str)
+        A list of sequences, all of which must be the same length.
+        Alternatively, an iterator yielding such sequences, or the name of
+        a FASTA, FASTQ, or text file (one sequence per line) containing
+        them, which can be gzip-compressed. Sequences are counted a fixed
+        number at a time, so iterators and files of any size can be used.
 
     counts: (None or list of numbers)
         If not None, must be a list of numbers the same length os sequences,
@@ -504,25 +787,643 @@ def alignment_to_matrix(sequences,
     pseudocount: (number >= 0.0)
         Pseudocount to use when converting from counts to probabilities.
 
+    n_jobs: (int)
+        Number of worker processes used to count sequences, which are sent
+        to workers in chunks. If 1, sequences are counted in the calling
+        process. If -1, one worker per processor is used.
+
+    collapse_duplicates: (bool)
+        If True, identical sequences are collapsed before counting, and the
+        corresponding elements of counts are summed. This can greatly reduce
+        the work needed for sequences with many duplicates, but requires
+        holding all distinct sequences in memory.
+
     returns
     -------
     out_df: (dataframe)
         A matrix of the requested type.
     """
 
-    # validate inputs
+    # validate options specifying the output matrix before counting
+    _check_alignment_output_options(to_type,
+                                    background,
+                                    characters_to_ignore,
+                                    center_weights)
 
-    # Make sure sequences is list-like
-    check(isinstance(sequences, (list, tuple, np.ndarray, pd.Series)),
-          'sequences must be a list, tuple, np.ndarray, or pd.Series.')
-    sequences = list(sequences)
+    # Count occurrences of each character at each position, weighted by
+    # counts
+    counts_accumulator = CountsAccumulator()
+    counts_accumulator.add(sequences,
+                           counts,
+                           n_jobs=n_jobs,
+                           collapse_duplicates=collapse_duplicates)
 
     # Make sure sequences has at least 1 element
-    check(len(sequences) > 0, 'sequences must have length > 0.')
+    check(counts_accumulator.N > 0, 'sequences must have length > 0.')
+
+    # Convert counts to matrix of requested type
+    return counts_accumulator.to_matrix(
+        to_type=to_type,
+        background=background,
+        characters_to_ignore=characters_to_ignore,
+        center_weights=center_weights,
+        pseudocount=pseudocount)
+
+
+@handle_errors
+def encoded_alignment_to_matrix(encoded_sequences,
+                                alphabet,
+                                counts=None,
+                                to_type='counts',
+                                background=None,
+                                characters_to_ignore='.-',
+                                center_weights=False,
+                                pseudocount=1.0):
+    """
+    Generates matrix from a sequence alignment that is already encoded as
+    an array, either of integer character codes or of one-hot vectors.
+    Characters are counted directly from this array, without converting it
+    to strings, so memory-mapped arrays (np.memmap) of any size can be used.
+
+    parameters
+    ----------
+    encoded_sequences: (np.ndarray)
+        Either an (N, L) array of integers, in which each element is the
+        index in alphabet of the character at the corresponding position
+        of the corresponding sequence, or an (N, L, C) array of numbers, in
+        which each element along the last axis gives the (e.g., one-hot)
+        occurrence of the corresponding character of alphabet.
+
+    alphabet: (str or list of str)
+        The characters corresponding to the codes or to the last axis of
+        encoded_sequences. Either 'dna', 'rna', or 'protein', or a string
+        or list of distinct single characters.
+
+    counts: (None or list of numbers)
+        If not None, must be a list of numbers of length N, containing the
+        (nonnegative) number of times that each sequence was observed. If
+        None, defaults to 1.
+
+    to_type: (str)
+        The type of matrix to output. Must be 'counts', 'probability',
+        'weight', or 'information'
+
+    background: (array, or df)
+        Specification of background probabilities. If array, should be the
+        same length as df.columns and correspond to the probability of each
+        column's character. If df, should be a probability matrix the same
+        shape as df.
+
+    characters_to_ignore: (str)
+        Characters of alphabet to ignore, e.g. gap characters.
+
+    center_weights: (bool)
+        Whether to subtract the mean of each row, but only if to_type=='weight'.
+
+    pseudocount: (number >= 0.0)
+        Pseudocount to use when converting from counts to probabilities.
 
-    # Make sure all elements are sequences
-    check(all(isinstance(seq, str) for seq in sequences),
-          'sequences must all be of type string')
+    returns
+    -------
+    out_df: (dataframe)
+        A matrix of the requested type, with one column for each character
+        in alphabet that is not ignored.
+    """
+
+    # validate options specifying the output matrix before counting
+    _check_alignment_output_options(to_type,
+                                    background,
+                                    characters_to_ignore,
+                                    center_weights)
+
+    # Count occurrences of each character at each position, weighted by
+    # counts
+    counts_accumulator = CountsAccumulator()
+    counts_accumulator.add_encoded(encoded_sequences, alphabet, counts)
+
+    # Make sure encoded_sequences has at least 1 sequence
+    check(counts_accumulator.N > 0,
+          'encoded_sequences must contain at least 1 sequence.')
+
+    # Convert counts to matrix of requested type
+    return counts_accumulator.to_matrix(
+        to_type=to_type,
+        background=background,
+        characters_to_ignore=characters_to_ignore,
+        center_weights=center_weights,
+        pseudocount=pseudocount)
+
+
+class CountsAccumulator:
+    """
+    CountsAccumulator accumulates the number of times each character occurs
+    at each position of a set of aligned sequences. Sequences can be added
+    a batch at a time, and the counts of different accumulators, e.g. for
+    shards of an alignment counted by different processes, can be combined
+    using merge() and subtract(). A matrix of any type can be computed from
+    the accumulated counts at any time using to_matrix().
+
+    attributes
+    ----------
+
+    L: (int or None)
+        Length of the sequences; None until sequences are first added.
+
+    N: (int)
+        Number of sequences added.
+
+    characters: (list of str)
+        Characters that occur in the sequences, in sorted order.
+
+    counts: (np.ndarray)
+        Array of shape (L, len(characters)) containing the number of times
+        each character occurs at each position. This array is of integer
+        type unless sequences with non-integer weights have been added.
+    """
+
+    @handle_errors
+    def __init__(self):
+        self.L = None
+        self.N = 0
+        self.characters = []
+        self.counts = np.zeros([0, 0], dtype=np.int64)
+
+    @handle_errors
+    def add(self, sequences, weights=None, n_jobs=1,
+            collapse_duplicates=False):
+        """
+        Adds the character counts of sequences. Sequences are counted a
+        fixed number at a time, so iterators and files of any size can be
+        used.
+
+        parameters
+        ----------
+
+        sequences: (list of strings, iterator, or str)
+            A list of sequences, all of which must have the same length,
+            including any sequences added previously. Alternatively, an
+            iterator yielding such sequences, or the name of a FASTA, FASTQ,
+            or text file (one sequence per line) containing them, which can
+            be gzip-compressed.
+
+        weights: (None or list of numbers)
+            If not None, must be a list of numbers the same length as
+            sequences, containing the (nonnegative) number of times that
+            each sequence was observed. If None, defaults to 1.
+
+        n_jobs: (int)
+            Number of worker processes used to count sequences. If 1,
+            sequences are counted in the calling process. If -1, one worker
+            per processor is used. Otherwise, sequences are read in the
+            calling process and sent a chunk at a time to the workers, which
+            validate, encode, and count them; their counts are combined in
+            order. Reading sequences, including parsing files, is not
+            parallelized.
+
+        collapse_duplicates: (bool)
+            If True, identical sequences are first collapsed into a single
+            sequence whose weight is the sum of their weights, so that each
+            distinct sequence is counted only once. This requires holding
+            all distinct sequences in memory, and greatly speeds up counting
+            when sequences contain many duplicates.
+
+        returns
+        -------
+        None
+        """
+
+        # validate n_jobs
+        check(isinstance(n_jobs, int) and not isinstance(n_jobs, bool) and
+              (n_jobs >= 1 or n_jobs == -1),
+              'n_jobs = %s; must be an int >= 1, or -1.' % repr(n_jobs))
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+
+        # If sequences is a file name, read sequences from file as needed
+        if isinstance(sequences, str):
+            check(os.path.isfile(sequences),
+                  'sequences = %s is not list-like and is not the name of '
+                  'an existing file.' % repr(sequences))
+            sequences = _read_sequence_file(sequences)
+
+        # Otherwise, make sure sequences is list-like or an iterator
+        else:
+            check(isinstance(sequences,
+                             (list, tuple, np.ndarray, pd.Series)) or
+                  _is_iterator(sequences),
+                  'sequences must be a list, tuple, np.ndarray, pd.Series, '
+                  'iterator, or file name.')
+
+        # validate weights as list-like
+        check(isinstance(weights, (list, tuple, np.ndarray, pd.Series)) or
+              (weights is None),
+              'counts must be None or a list, tuple, np.ndarray, '
+              'or pd.Series.')
+
+        # make sure weights has the same length as sequences, if known
+        if weights is not None:
+            weights = np.asarray(weights)
+            check(np.issubdtype(weights.dtype, np.number),
+                  'counts must contain only numbers.')
+            if hasattr(sequences, '__len__'):
+                check(len(weights) == len(sequences),
+                      'counts must be the same length as sequences;'
+                      'len(counts) = %d; len(sequences) = %d' %
+                      (len(weights), len(sequences)))
+
+        # validate collapse_duplicates
+        check(isinstance(collapse_duplicates, bool),
+              'type(collapse_duplicates) = %s; must be bool.' %
+              type(collapse_duplicates))
+
+        # collapse duplicate sequences, summing their weights, but record
+        # the number of sequences before collapsing
+        num_sequences = None
+        if collapse_duplicates:
+            sequences, weights, num_sequences = \
+                _collapse_duplicates(sequences, weights)
+
+        # count sequences one chunk at a time, using worker processes if
+        # requested. Chunks are read here, and validated, encoded, and
+        # counted here or in a worker. Workers do not share the validation
+        # level of this thread, so it is passed to them.
+        full_validation = _is_full_validation()
+        executor = ProcessPoolExecutor(max_workers=n_jobs) \
+            if n_jobs > 1 else None
+        pending = deque()
+        num_added = 0
+        L = self.L
+        iterator = iter(sequences)
+        try:
+            while True:
+
+                # get next chunk of sequences
+                chunk = list(islice(iterator, SEQUENCE_CHUNK_SIZE))
+                if len(chunk) == 0:
+                    break
+
+                # get sequence length from the first sequence; it is set
+                # when the counts of the first chunk are added
+                if L is None:
+                    check(isinstance(chunk[0], str),
+                          'sequences must all be of type string')
+                    L = len(chunk[0])
+
+                # join sequences into a single string, which is much faster
+                # to send to a worker than a list of sequences
+                try:
+                    joined = SEQUENCE_SEPARATOR.join(chunk)
+                except TypeError:
+                    check(False, 'sequences must all be of type string')
+
+                # get weights of sequences in chunk
+                if weights is None:
+                    chunk_weights = np.ones(len(chunk))
+                else:
+                    chunk_weights = weights[num_added:num_added + len(chunk)]
+                    check(len(chunk_weights) == len(chunk),
+                          'counts must be the same length as sequences; '
+                          'len(counts) = %d' % len(weights))
+
+                # count characters in chunk here or in a worker
+                if executor is None:
+                    self._add_counts(*_count_chunk(joined,
+                                                   len(chunk),
+                                                   L,
+                                                   chunk_weights,
+                                                   full_validation))
+                else:
+                    pending.append(executor.submit(_count_chunk,
+                                                   joined,
+                                                   len(chunk),
+                                                   L,
+                                                   chunk_weights,
+                                                   full_validation))
+
+                    # limit the number of chunks held in memory
+                    if len(pending) >= 2 * n_jobs:
+                        self._add_counts(*pending.popleft().result())
+
+                num_added += len(chunk)
+
+            # add counts of remaining chunks
+            while len(pending) > 0:
+                self._add_counts(*pending.popleft().result())
+
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        # make sure weights has the same length as sequences
+        if weights is not None:
+            check(len(weights) == num_added,
+                  'counts must be the same length as sequences;'
+                  'len(counts) = %d; len(sequences) = %d' %
+                  (len(weights), num_added))
+
+        self.N += num_added if num_sequences is None else num_sequences
+
+    @handle_errors
+    def add_encoded(self, encoded_sequences, alphabet, weights=None):
+        """
+        Adds the character counts of sequences encoded as an array, either
+        of integer character codes or of one-hot vectors. Characters are
+        counted directly from this array a fixed number of sequences at a
+        time, so memory-mapped arrays (np.memmap) of any size can be used.
+        All characters of alphabet are added, even those that do not occur.
+
+        parameters
+        ----------
+
+        encoded_sequences: (np.ndarray)
+            Either an (N, L) array of integers, in which each element is
+            the index in alphabet of the character at the corresponding
+            position of the corresponding sequence, or an (N, L, C) array of
+            numbers, in which each element along the last axis gives the
+            (e.g., one-hot) occurrence of the corresponding character of
+            alphabet. L must equal that of sequences added previously.
+
+        alphabet: (str or list of str)
+            The characters corresponding to the codes or to the last axis
+            of encoded_sequences. Either 'dna', 'rna', or 'protein', or a
+            string or list of distinct single characters.
+
+        weights: (None or list of numbers)
+            If not None, must be a list of N numbers containing the
+            (nonnegative) number of times that each sequence was observed.
+            If None, defaults to 1.
+
+        returns
+        -------
+        None
+        """
+
+        # get characters of alphabet
+        characters = _get_alphabet_characters(alphabet)
+        C = len(characters)
+
+        # validate encoded_sequences
+        check(isinstance(encoded_sequences, np.ndarray),
+              'type(encoded_sequences) = %s; must be a np.ndarray.' %
+              type(encoded_sequences))
+        check(encoded_sequences.ndim in (2, 3),
+              'encoded_sequences.ndim = %d; must be 2 (integer codes) '
+              'or 3 (one-hot vectors).' % encoded_sequences.ndim)
+        if encoded_sequences.ndim == 2:
+            check(np.issubdtype(encoded_sequences.dtype, np.integer),
+                  'encoded_sequences.dtype = %s; 2-dimensional '
+                  'encoded_sequences must contain integer codes.' %
+                  encoded_sequences.dtype)
+        else:
+            check(np.issubdtype(encoded_sequences.dtype, np.number) or
+                  np.issubdtype(encoded_sequences.dtype, np.bool_),
+                  'encoded_sequences.dtype = %s; 3-dimensional '
+                  'encoded_sequences must contain numbers.' %
+                  encoded_sequences.dtype)
+            check(encoded_sequences.shape[2] == C,
+                  'encoded_sequences.shape[2] = %d does not match the '
+                  'number of characters in alphabet, %d.' %
+                  (encoded_sequences.shape[2], C))
+        N, L = encoded_sequences.shape[:2]
+
+        # validate weights
+        if weights is None:
+            weights = np.ones(N)
+        else:
+            check(isinstance(weights, (list, tuple, np.ndarray, pd.Series)),
+                  'counts must be None or a list, tuple, np.ndarray, '
+                  'or pd.Series.')
+            weights = np.asarray(weights)
+            check(np.issubdtype(weights.dtype, np.number),
+                  'counts must contain only numbers.')
+            check(len(weights) == N,
+                  'counts must be the same length as sequences;'
+                  'len(counts) = %d; len(sequences) = %d' %
+                  (len(weights), N))
+
+        # nothing to add if there are no sequences
+        if N == 0:
+            return
+
+        # Make sure sequence length matches that of previous sequences
+        check(self.L is None or L == self.L,
+              'encoded sequences have length %d; must have length %s.' %
+              (L, self.L))
+
+        # count characters a chunk of sequences at a time, so that only
+        # one chunk of a memory-mapped array is loaded at once
+        counts = np.zeros([L, C])
+        rows_per_chunk = max(1, ENCODED_CHUNK_SIZE //
+                             max(int(np.prod(encoded_sequences.shape[1:])), 1))
+        for start in range(0, N, rows_per_chunk):
+            chunk = np.asarray(encoded_sequences[start:start + rows_per_chunk])
+            chunk_weights = weights[start:start + rows_per_chunk]
+
+            # count integer codes, making sure each indexes alphabet
+            if chunk.ndim == 2:
+                if _is_full_validation():
+                    check(chunk.size == 0 or
+                          (chunk.min() >= 0 and chunk.max() < C),
+                          'encoded_sequences contains codes outside the '
+                          'range [0, %d) of alphabet indices.' % C)
+                counts += _count_codes(chunk, chunk_weights, C)
+
+            # sum one-hot vectors
+            else:
+                counts += np.tensordot(chunk_weights,
+                                       chunk.astype(float),
+                                       axes=(0, 0))
+
+        # Set sequence length
+        if self.L is None:
+            self._resize(L)
+
+        self._add_counts(characters, counts)
+        self.N += N
+
+    @handle_errors
+    def merge(self, other):
+        """
+        Adds the counts of another CountsAccumulator to this one.
+
+        parameters
+        ----------
+
+        other: (CountsAccumulator)
+            The accumulator whose counts to add.
+
+        returns
+        -------
+        None
+        """
+
+        # validate other
+        self._check_compatible(other)
+
+        # add counts, if other has any
+        if other.L is not None:
+            self._add_counts(other.characters, other.counts)
+            self.N += other.N
+
+    @handle_errors
+    def subtract(self, other):
+        """
+        Subtracts the counts of another CountsAccumulator from this one,
+        e.g. to remove sequences that were added previously. Characters
+        whose counts become zero are retained.
+
+        parameters
+        ----------
+
+        other: (CountsAccumulator)
+            The accumulator whose counts to subtract. Each of its counts
+            must not exceed the corresponding count of this accumulator.
+
+        returns
+        -------
+        None
+        """
+
+        # validate other; nothing to do if other has no counts
+        self._check_compatible(other)
+        if other.L is None:
+            return
+        missing = [c for c in other.characters if c not in self.characters]
+        check(len(missing) == 0,
+              'cannot subtract counts of characters %s not present in '
+              'this accumulator.' % missing)
+        check(other.N <= self.N,
+              'cannot subtract %d sequences from %d sequences.' %
+              (other.N, self.N))
+
+        # compute new counts, and make sure these are nonnegative
+        indices = [self.characters.index(c) for c in other.characters]
+        counts = self.counts.astype(np.result_type(self.counts, other.counts))
+        counts[:, indices] -= other.counts
+        check(np.all(counts >= 0),
+              'cannot subtract counts larger than those accumulated.')
+
+        self.counts = counts
+        self.N -= other.N
+
+    @handle_errors
+    def to_matrix(self,
+                  to_type='counts',
+                  background=None,
+                  characters_to_ignore='.-',
+                  center_weights=False,
+                  pseudocount=1.0):
+        """
+        Generates a matrix from the accumulated counts.
+
+        parameters
+        ----------
+
+        to_type, background, characters_to_ignore, center_weights,
+        pseudocount:
+            As in alignment_to_matrix().
+
+        returns
+        -------
+        out_df: (dataframe)
+            A matrix of the requested type.
+        """
+
+        # validate inputs
+        _check_alignment_output_options(to_type,
+                                        background,
+                                        characters_to_ignore,
+                                        center_weights)
+
+        # Make sure sequences have been added
+        check(self.N > 0, 'no sequences have been added.')
+
+        # Remove characters to ignore
+        keep = [i for i, c in enumerate(self.characters)
+                if not c in characters_to_ignore]
+        columns = [self.characters[i] for i in keep]
+        index = list(range(self.L))
+        counts_df = pd.DataFrame(data=self.counts[:, keep].astype(float),
+                                 columns=columns,
+                                 index=index)
+
+        # Convert counts matrix to matrix of requested type
+        out_df = transform_matrix(counts_df,
+                                  from_type='counts',
+                                  to_type=to_type,
+                                  pseudocount=pseudocount,
+                                  background=background)
+
+        # Center values only if center_weights is True and to_type is
+        # 'weight'
+        if center_weights and to_type == 'weight':
+            out_df = transform_matrix(out_df, center_values=True)
+
+        return out_df
+
+    def _resize(self, L):
+        """ Sets the sequence length L, allocating counts as needed. """
+        self.L = L
+        self.counts = np.zeros([L, len(self.characters)],
+                               dtype=self.counts.dtype)
+
+    def _add_counts(self, characters, counts):
+        """
+        Adds an array of counts whose columns correspond to the given
+        characters, adding new characters as needed. Sets the sequence
+        length if it is not yet set.
+        """
+
+        # set sequence length
+        if self.L is None:
+            self._resize(counts.shape[0])
+
+        # add new characters, keeping characters sorted
+        new_characters = [c for c in characters if c not in self.characters]
+        if len(new_characters) > 0:
+            all_characters = sorted(self.characters + new_characters)
+            all_counts = np.zeros([self.L, len(all_characters)],
+                                  dtype=self.counts.dtype)
+            all_counts[:, [all_characters.index(c)
+                           for c in self.characters]] = self.counts
+            self.characters = all_characters
+            self.counts = all_counts
+
+        # store counts as floats if added counts are not integers
+        if np.issubdtype(self.counts.dtype, np.integer) and \
+                not np.all(counts == np.round(counts)):
+            self.counts = self.counts.astype(float)
+        elif np.issubdtype(self.counts.dtype, np.integer):
+            counts = np.round(counts).astype(self.counts.dtype)
+
+        # add counts
+        indices = [self.characters.index(c) for c in characters]
+        self.counts[:, indices] += counts
+
+    def _check_compatible(self, other):
+        """
+        Checks that other is a CountsAccumulator whose counts can be
+        combined with those of this one, and sets L if needed.
+        """
+        check(isinstance(other, CountsAccumulator),
+              'type(other) = %s; must be a CountsAccumulator.' % type(other))
+        if other.L is not None:
+            if self.L is None:
+                self._resize(other.L)
+            check(other.L == self.L,
+                  'cannot combine counts for sequences of length %d '
+                  'with counts for sequences of length %d.' %
+                  (other.L, self.L))
+
+
+def _check_alignment_output_options(to_type,
+                                    background,
+                                    characters_to_ignore,
+                                    center_weights):
+    """
+    Validates the options of alignment_to_matrix() that specify the
+    output matrix.
+    """
 
     # validate characters_to_ignore
     check(isinstance(characters_to_ignore, str),
@@ -532,27 +1433,6 @@ def alignment_to_matrix(sequences,
     check(isinstance(center_weights, bool),
           'type(center_weights) = %s; must be bool.' % type(center_weights))
 
-    # Get sequence length
-    L = len(sequences[0])
-
-    # Make sure all sequences are the same length
-    check(all([len(s) == L for s in sequences]),
-          'all elements of sequences must have the same length.')
-
-    # validate counts as list-like
-    check(isinstance(counts, (list, tuple, np.ndarray, pd.Series)) or
-          (counts is None),
-          'counts must be None or a list, tuple, np.ndarray, or pd.Series.')
-
-    # make sure counts has the same length as sequences
-    if counts is None:
-        counts = np.ones(len(sequences))
-    else:
-        check(len(counts) == len(sequences),
-              'counts must be the same length as sequences;'
-              'len(counts) = %d; len(sequences) = %d' %
-              (len(counts), len(sequences)))
-
     # validate background
     check(isinstance(background, (type([]), np.ndarray, pd.DataFrame)) or
           (background is None),
@@ -566,35 +1446,378 @@ def alignment_to_matrix(sequences,
     check(to_type in valid_types,
           'to_type=%s; must be in %s' % (to_type, valid_types))
 
-    # Create a 2D array of characters
-    char_array = np.array([np.array(list(seq)) for seq in sequences])
 
-    # Get list of unique characters
-    unique_characters = np.unique(char_array.ravel())
-    unique_characters.sort()
+def _read_sequence_file(file_name):
+    """
+    Yields the sequences in a FASTA, FASTQ, or text file (one sequence per
+    line), which can be gzip-compressed. The format is determined from the
+    first line that is neither blank nor a comment starting with '#'. FASTA
+    sequences can span multiple lines; FASTQ records must have four lines.
+    """
 
-    # Remove characters to ignore
-    columns = [c for c in unique_characters if not c in characters_to_ignore]
-    index = list(range(L))
-    counts_df = pd.DataFrame(data=0, columns=columns, index=index)
+    # open file, decompressing it if needed
+    with open(file_name, 'rb') as f:
+        is_gzip = (f.read(2) == b'\x1f\x8b')
+    if is_gzip:
+        f = gzip.open(file_name, 'rt')
+    else:
+        f = open(file_name, 'r')
+
+    with f:
+        lines = (line.strip() for line in f)
+        file_format = None
+        seq_lines = None
+        for line in lines:
+
+            # skip blank and comment lines, except within FASTQ records
+            if not line or line.startswith('#'):
+                continue
+
+            # determine file format
+            if file_format is None:
+                if line.startswith('>'):
+                    file_format = 'fasta'
+                elif line.startswith('@'):
+                    file_format = 'fastq'
+                else:
+                    file_format = 'text'
+
+            # FASTQ: read sequence, then skip separator and quality lines
+            if file_format == 'fastq':
+                check(line.startswith('@'),
+                      'invalid FASTQ record header %s' % repr(line))
+                record = list(islice(lines, 3))
+                check(len(record) == 3 and record[1].startswith('+'),
+                      'incomplete or invalid FASTQ record %s' % repr(line))
+                yield record[0]
+
+            # FASTA: join lines following each header
+            elif file_format == 'fasta':
+                if line.startswith('>'):
+                    if seq_lines is not None:
+                        yield ''.join(seq_lines)
+                    seq_lines = []
+                else:
+                    seq_lines.append(line)
+
+            # text: each line is a sequence
+            else:
+                yield line
 
-    # Sum of the number of occurrences of each character at each position
-    for c in columns:
-        tmp_mat = (char_array == c).astype(float) * counts[:, np.newaxis]
-        counts_df.loc[:, c] = tmp_mat.sum(axis=0).T
+        # yield last FASTA sequence
+        if seq_lines is not None:
+            yield ''.join(seq_lines)
 
-    # Convert counts matrix to matrix of requested type
-    out_df = transform_matrix(counts_df,
-                              from_type='counts',
-                              to_type=to_type,
-                              pseudocount=pseudocount,
-                              background=background)
 
-    # Center values only if center_weights is True and to_type is 'weight'
-    if center_weights and to_type == 'weight':
-        out_df = transform_matrix(out_df, center_values=True)
+def _is_iterator(x):
+    """ Returns True if x is an iterator, e.g., a generator. """
+    return hasattr(x, '__next__') or hasattr(x, 'next')
+
+
+def _get_alphabet_characters(alphabet):
+    """
+    Returns the list of characters specified by alphabet, which is either
+    the name of a built-in alphabet or a string or list of distinct
+    single characters.
+    """
+
+    # get characters of built-in alphabet
+    if isinstance(alphabet, str) and alphabet in ALPHABET_DICT:
+        return list(ALPHABET_DICT[alphabet])
+
+    # otherwise, validate custom alphabet
+    check(isinstance(alphabet, (str, list, tuple, np.ndarray)),
+          'type(alphabet) = %s; must be one of %s, or a string or list of '
+          'characters.' % (type(alphabet), list(ALPHABET_DICT.keys())))
+    characters = list(alphabet)
+    check(len(characters) > 0 and
+          all(isinstance(c, str) and len(c) == 1 for c in characters),
+          'alphabet = %s; must be one of %s, or a string or list of single '
+          'characters.' % (repr(alphabet), list(ALPHABET_DICT.keys())))
+    check(len(set(characters)) == len(characters),
+          'alphabet = %s contains duplicate characters.' % repr(alphabet))
+    return characters
+
+
+def _check_batch_sequences(sequences):
+    """
+    Checks that sequences is a nonempty list of strings of the same length,
+    or an (N, L) array of single characters.
+    """
+    check(isinstance(sequences, (list, tuple, np.ndarray, pd.Series)),
+          'type(sequences) = %s; must be a list, tuple, np.ndarray, '
+          'or pd.Series.' % type(sequences))
+    check(len(sequences) > 0, 'sequences must have length > 0.')
+    if isinstance(sequences, np.ndarray) and sequences.ndim == 2:
+        check(sequences.dtype.kind == 'U' and sequences.dtype.itemsize == 4,
+              'sequences.dtype = %s; 2-dimensional sequences must be an '
+              'array of single characters.' % sequences.dtype)
+
+        # empty elements of the array have ordinal 0
+        if _is_full_validation():
+            check(np.all(_get_ordinals(sequences) != 0),
+                  'sequences must be an array of single characters.')
+    elif _is_full_validation():
+        check(all(isinstance(seq, str) for seq in sequences),
+              'sequences must all be of type string')
+        L = len(next(iter(sequences)))
+        check(all(len(seq) == L for seq in sequences),
+              'all elements of sequences must have the same length.')
+
+
+def _get_ordinals(sequences):
+    """
+    Returns an (N, L) array containing the ordinals of the characters in N
+    sequences of length L, given either as a list of strings or as an
+    (N, L) array of single characters.
+    """
+    if isinstance(sequences, np.ndarray) and sequences.ndim == 2:
+        return np.ascontiguousarray(sequences, dtype='U1').view(np.uint32)
+    joined = ''.join(sequences)
+    L = len(next(iter(sequences), ''))
+    check(len(joined) == len(sequences) * L,
+          'all elements of sequences must have the same length.')
+    ordinals = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32)
+    return ordinals.reshape(len(sequences), L)
+
+
+def _encode_characters(sequences, cols, is_iupac=False):
+    """
+    Encodes N sequences of length L as an (N, L, len(cols)) array, in which
+    each character is replaced by its one-hot encoding over cols or, if
+    is_iupac, by the indicator vector of the bases that it represents.
+    Encodings are looked up in a table with one row for each valid
+    character.
+    """
+
+    # get valid characters and the table of their encodings
+    if is_iupac:
+        characters = list(IUPAC_DICT.keys())
+        table = np.array([[float(b in IUPAC_DICT[c]) for b in cols]
+                          for c in characters])
+    else:
+        characters = list(cols)
+        table = np.eye(len(cols))
+
+    return table[_get_character_indices(sequences, characters, is_iupac)]
+
+
+def _get_character_indices(sequences, characters, is_iupac=False):
+    """
+    Returns an (N, L) array containing the index in characters of each
+    character in N sequences of length L. Every character in sequences
+    must be in characters, which are IUPAC characters if is_iupac and
+    otherwise are the columns of the matrix being constructed.
+    """
+
+    # make sure characters contains only single characters
+    check(all(isinstance(c, str) and len(c) == 1 for c in characters),
+          'cols = %s; must contain only single characters.' %
+          repr(characters))
+
+    # find the index of each character in sequences by searching the
+    # sorted ordinals of characters
+    ordinals = _get_ordinals(sequences)
+    table_ordinals = np.array([ord(c) for c in characters], dtype=np.uint32)
+    order = np.argsort(table_ordinals, kind='mergesort')
+    sorted_ordinals = table_ordinals[order]
+    positions = np.searchsorted(sorted_ordinals, ordinals)
+    positions = np.minimum(positions, len(characters) - 1)
+    is_valid = (sorted_ordinals[positions] == ordinals) \
+        if len(characters) > 0 else np.zeros(ordinals.shape, dtype=bool)
+
+    # report the first invalid character, if any
+    if not np.all(is_valid):
+        n, i = np.argwhere(~is_valid)[0]
+        c = chr(ordinals[n, i])
+        where = 'position %d' % i if len(ordinals) == 1 else \
+            'position %d of sequence %d' % (i, n)
+        if is_iupac:
+            check(False,
+                  'character %s at %s is not a valid IUPAC character;'
+                  'must be one of %s' % (c, where, characters))
+        else:
+            check(False,
+                  'character %s at %s is not in cols=%s' %
+                  (c, where, characters))
+
+    return order[positions]
+
+
+def _fill_saliency(indices, values, C):
+    """
+    Returns an (N, L, C) array that is zero except at the index of the
+    character at each position of each sequence, given by an (N, L) array
+    of indices, where it equals the corresponding element of values, which
+    is either an (N, L) array or an (N, L, C) array.
+    """
+    saliency_array = np.zeros(indices.shape + (C,))
+    indices = indices[..., np.newaxis]
+    if values.ndim == 2:
+        values = values[..., np.newaxis]
+    else:
+        values = np.take_along_axis(values, indices, axis=-1)
+    np.put_along_axis(saliency_array, indices, values, axis=-1)
+    return saliency_array
 
-    return out_df
+
+class _SaliencyMatrices(Sequence):
+    """
+    Read-only sequence of saliency matrices (dataframes), as returned by
+    batch_saliency_to_matrix(as_dataframes=True). Each matrix is computed
+    when it is accessed, so only one matrix is held in memory at a time.
+    """
+
+    def __init__(self, indices, values, cols):
+        self._indices = indices
+        self._values = values
+        self._cols = cols
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, key):
+
+        # return a list of matrices if key is a slice
+        if isinstance(key, slice):
+            return [self[n] for n in range(len(self))[key]]
+
+        # compute matrix of a single sequence
+        n = range(len(self))[key]
+        saliency_array = _fill_saliency(self._indices[n:n + 1],
+                                        self._values[n:n + 1],
+                                        len(self._cols))
+        saliency_df = pd.DataFrame(data=saliency_array[0],
+                                   columns=self._cols,
+                                   index=pd.RangeIndex(self._indices.shape[1],
+                                                       name='pos'))
+        if np.all(np.isfinite(saliency_array)):
+            _mark_validated(saliency_df)
+        return saliency_df
+
+
+def _collapse_duplicates(sequences, weights=None):
+    """
+    Collapses identical sequences, summing their weights (which default to
+    1). Returns the list of distinct sequences, in order of first
+    occurrence, an array of their summed weights, and the number of
+    sequences before collapsing.
+    """
+
+    try:
+
+        # count occurrences of each sequence
+        if weights is None:
+            collapsed = Counter(sequences)
+            num_sequences = sum(collapsed.values())
+
+        # sum weights of each sequence
+        else:
+            collapsed = OrderedDict()
+            num_sequences = 0
+            for seq, weight in zip(sequences, weights):
+                collapsed[seq] = collapsed.get(seq, 0) + weight
+                num_sequences += 1
+
+    # sequences that are not hashable are not strings
+    except TypeError:
+        check(False, 'sequences must all be of type string')
+
+    # make sure weights has the same length as sequences
+    if weights is not None:
+        check(len(weights) == num_sequences,
+              'counts must be the same length as sequences;'
+              'len(counts) = %d; len(sequences) = %d' %
+              (len(weights), num_sequences))
+
+    unique_sequences = list(collapsed.keys())
+    unique_weights = np.array(list(collapsed.values()))
+    return unique_sequences, unique_weights, num_sequences
+
+
+def _count_chunk(joined, N, L, weights, full_validation=True):
+    """
+    Counts the characters in N sequences of length L, joined by
+    SEQUENCE_SEPARATOR into a single string, with sequences weighted by
+    weights. The length of each sequence is checked only if full_validation
+    is True. Returns the list of characters present, together with an array
+    containing the counts of these characters at each position.
+    """
+    codes, code_chars = _encode_sequences(joined, N, L, full_validation)
+    counts_array = _count_codes(codes, weights, len(code_chars))
+    present = np.flatnonzero(np.bincount(codes.ravel(),
+                                         minlength=len(code_chars)))
+    return [code_chars[i] for i in present], counts_array[:, present]
+
+
+def _encode_sequences(joined, N, L, full_validation=True):
+    """
+    Encodes N sequences of length L, joined by SEQUENCE_SEPARATOR into a
+    single string, as an (N, L) array of character codes. Returns this
+    array together with the list of characters corresponding to each code;
+    codes follow character order. The length of each sequence is checked
+    only if full_validation is True.
+    """
+
+    # Make sure sequences have the right total length. This is checked
+    # even when sequences are not validated individually.
+    check(len(joined) == N * (L + 1) - 1,
+          'all elements of sequences must have the same length.')
+
+    # add a final separator, so that each sequence is followed by one
+    joined += SEQUENCE_SEPARATOR
+
+    # Sequences containing only latin-1 characters are encoded as uint8
+    # arrays, in which codes are the characters' ordinals
+    try:
+        codes = np.frombuffer(joined.encode('latin-1'), dtype=np.uint8)
+        code_chars = [chr(i) for i in range(256)]
+
+    # Otherwise, number the unique characters in sequences
+    except UnicodeEncodeError:
+        ordinals = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32)
+        uniques, codes = np.unique(ordinals, return_inverse=True)
+        code_chars = [chr(i) for i in uniques]
+    codes = codes.reshape(N, L + 1)
+
+    # Make sure each sequence has length L. This is the case if separators
+    # occur only after each sequence, and so only in the last column.
+    if full_validation:
+        separator_code = code_chars.index(SEQUENCE_SEPARATOR)
+        check(np.all(codes[:, L] == separator_code) and
+              np.count_nonzero(codes == separator_code) == N,
+              'all elements of sequences must have the same length, and '
+              'must not contain newlines.')
+
+    return codes[:, :L], code_chars
+
+
+def _count_codes(codes, weights, num_codes, chunk_size=2**22):
+    """
+    Returns an (L, num_codes) array containing the number of occurrences of
+    each code at each position of an (N, L) array of codes, with each row
+    weighted by the corresponding element of weights. Counting is done
+    using a single weighted bincount over (position, code) pairs per chunk
+    of about chunk_size codes.
+    """
+
+    N, L = codes.shape
+    counts_array = np.zeros(L * num_codes)
+
+    # offsets mapping (position, code) pairs to bins
+    offsets = num_codes * np.arange(L)
+
+    # count codes in chunks of rows, to limit memory use
+    rows_per_chunk = max(1, chunk_size // max(L, 1))
+    for start in range(0, N, rows_per_chunk):
+        chunk = codes[start:start + rows_per_chunk]
+        bins = (chunk + offsets).ravel()
+        chunk_weights = np.repeat(weights[start:start + rows_per_chunk], L)
+        counts_array += np.bincount(bins,
+                                    weights=chunk_weights,
+                                    minlength=L * num_codes)
+
+    return counts_array.reshape(L, num_codes)
 
 
 @handle_errors
@@ -690,44 +1913,12 @@ def sequence_to_matrix(seq,
         check(alphabet is None, 'must have alphabet=None if is_iupac=True')
         cols = list(ALPHABET_DICT['dna'])
 
-    # Initialize counts dataframe
-    L = len(seq)
-    index = list(range(L))
-    counts_df = pd.DataFrame(data=0.0, columns=cols, index=index)
-
-    # If is_iupac, fill counts_df:
-    if is_iupac:
-
-        # Get list of valid IUPAC characters
-        iupac_characters = list(IUPAC_DICT.keys())
-
-        # Iterate over sequence positions
-        for i, c in enumerate(seq):
-
-            # Check that c is in the set of valid IUPAC characters
-            check(c in iupac_characters,
-                  'character %s at position %d is not a valid IUPAC character;'
-                  'must be one of %s' %
-                  (c, i, iupac_characters))
-
-            # Fill in a count for each possible base
-            bs = IUPAC_DICT[c]
-            for b in bs:
-                counts_df.loc[i, b] = 1.0
-
-    # Otherwise, fill counts the normal way
-    else:
-
-        # Iterate over sequence positions
-        for i, c in enumerate(seq):
-
-            # Check that c is in columns
-            check(c in cols,
-                  'character %s at position %d is not in cols=%s' %
-                  (c, i, cols))
-
-            # Increment counts_df
-            counts_df.loc[i, c] = 1.0
+    # Fill counts dataframe, using a lookup table from each character to
+    # its one-hot (or, if is_iupac, IUPAC) encoding
+    cols = list(cols)
+    counts_df = pd.DataFrame(data=_encode_characters([seq], cols, is_iupac)[0],
+                             columns=cols,
+                             index=list(range(len(seq))))
 
     # Convert to requested type
     out_df = transform_matrix(counts_df,
@@ -742,6 +1933,92 @@ def sequence_to_matrix(seq,
     return out_df
 
 
+@handle_errors
+def batch_sequence_to_matrix(sequences,
+                             cols=None,
+                             alphabet=None,
+                             is_iupac=False):
+    """
+    Generates probability matrices for many sequences of the same length in
+    one call, returning them as a single 3D array. With default keyword
+    arguments, this is a one-hot encoding of the sequences provided. The
+    matrix of each sequence equals that returned by sequence_to_matrix()
+    with to_type='probability'.
+
+    parameters
+    ----------
+
+    sequences: (list of str, or np.ndarray)
+        N sequences, all of which must have the same length L. Can also be
+        an (N, L) array of single characters.
+
+    cols: (str or array-like or None)
+        The characters to use for the matrix columns. If None, cols is
+        constructed from the unique characters in sequences. Overriden by
+        alphabet and is_iupac.
+
+    alphabet: (str or None)
+        The alphabet used to determine the columns of the matrix.
+        Options are: 'dna', 'rna', 'protein'. Ignored if None. Overrides cols.
+
+    is_iupac: (bool)
+        If True, it is assumed that the sequences represent IUPAC DNA
+        strings. In this case, cols is overridden, and alphabet must be None.
+
+    returns
+    -------
+    seq_array: (np.ndarray)
+        Array of shape (N, L, C), where C is the number of columns. Columns
+        are in sorted order along the last axis, as in the matrices
+        returned by sequence_to_matrix().
+    """
+
+    # validate sequences
+    _check_batch_sequences(sequences)
+
+    # validate is_iupac
+    check(isinstance(is_iupac, bool),
+          'type(is_iupac) = %s; must be bool.' % type(is_iupac))
+
+    # If is_iupac, override alphabet and cols
+    if is_iupac:
+
+        # Check that alphabet has not been specified
+        check(alphabet is None, 'must have alphabet=None if is_iupac=True')
+        cols = list(ALPHABET_DICT['dna'])
+
+    # If alphabet is specified, override cols
+    elif alphabet is not None:
+
+        # Validate alphabet
+        valid_alphabets = list(ALPHABET_DICT.keys())
+        check(alphabet in valid_alphabets,
+              'alphabet = %s; must be in %s.' % (alphabet, valid_alphabets))
+
+        # Set cols
+        cols = list(ALPHABET_DICT[alphabet])
+
+    # If cols is None, set to list of unique characters in sequences
+    elif cols is None:
+        cols = [chr(i) for i in np.unique(_get_ordinals(sequences))]
+
+    # Otherwise, validate cols
+    else:
+        cols_types = (str, list, set, np.ndarray)
+        check(isinstance(cols, cols_types),
+              'cols = %s must be None or a string, set, list, or np.ndarray'
+              % repr(cols))
+
+    # encode sequences, with columns in sorted order
+    seq_array = _encode_characters(sequences, sorted(cols), is_iupac)
+
+    # Normalize IUPAC encodings to probabilities
+    if is_iupac:
+        seq_array /= seq_array.sum(axis=2, keepdims=True)
+
+    return seq_array
+
+
 @handle_errors
 def saliency_to_matrix(seq, values, cols=None, alphabet=None):
     """
@@ -848,3 +2125,110 @@ def saliency_to_matrix(seq, values, cols=None, alphabet=None):
 
     return saliency_df
 
+
+@handle_errors
+def batch_saliency_to_matrix(sequences,
+                             values,
+                             cols=None,
+                             alphabet=None,
+                             as_dataframes=False):
+    """
+    Generates saliency matrices for many sequences of the same length in
+    one call. For each sequence, the returned matrix S is nonzero only at
+    S_ic with c the character at position i of that sequence, where it
+    equals the value of that position (or, if values are given for every
+    character, the value of that position and character). The matrix of
+    each sequence equals that returned by saliency_to_matrix(), given the
+    same columns.
+
+    example usage:
+
+    saliency_array = logomaker.batch_saliency_to_matrix(sequences, values)
+    logomaker.Logo(logomaker.batch_saliency_to_matrix(sequences, values,
+                                                      as_dataframes=True)[0])
+
+    parameters
+    ----------
+
+    sequences: (list of str, or np.ndarray)
+        N sequences, all of which must have the same length L. Can also be
+        an (N, L) array of single characters.
+
+    values: (np.ndarray)
+        Either an (N, L) array of values for each position of each
+        sequence, or an (N, L, C) array of values for each character at
+        each position of each sequence, e.g. attribution scores, in which
+        the last axis corresponds to the columns in sorted order.
+
+    cols: (str or array-like or None)
+        The characters to use for the matrix columns. If None, cols is
+        constructed from the unique characters in sequences. Overridden by
+        alphabet.
+
+    alphabet: (str or None)
+        The alphabet used to determine the columns of the matrix.
+        Options are: 'dna', 'rna', 'protein'. Ignored if None. Overrides cols.
+
+    as_dataframes: (bool)
+        If True, a sequence of N saliency dataframes is returned, each of
+        which is computed only when it is accessed. Otherwise, a single
+        array is returned.
+
+    returns
+    -------
+    saliency_matrices: (np.ndarray or sequence of dataframes)
+        Either an array of shape (N, L, C), where C is the number of
+        columns, in which columns are in sorted order along the last axis,
+        or, if as_dataframes is True, a sequence of N saliency dataframes.
+    """
+
+    # validate sequences
+    _check_batch_sequences(sequences)
+
+    # validate as_dataframes
+    check(isinstance(as_dataframes, bool),
+          'type(as_dataframes) = %s; must be bool.' % type(as_dataframes))
+
+    # If alphabet is specified, override cols
+    if alphabet is not None:
+
+        # Validate alphabet
+        valid_alphabets = list(ALPHABET_DICT.keys())
+        check(alphabet in valid_alphabets,
+              'alphabet = %s; must be in %s.' % (alphabet, valid_alphabets))
+
+        # Set cols
+        cols = list(ALPHABET_DICT[alphabet])
+
+    # If cols is None, set to list of unique characters in sequences
+    elif cols is None:
+        cols = [chr(i) for i in np.unique(_get_ordinals(sequences))]
+
+    # Otherwise, validate cols
+    else:
+        cols_types = (str, list, set, np.ndarray)
+        check(isinstance(cols, cols_types),
+              'cols = %s must be None or a string, set, list, or np.ndarray'
+              % repr(cols))
+    cols = sorted(cols)
+
+    # find index of each character of sequences in cols
+    indices = _get_character_indices(sequences, cols)
+
+    # validate values
+    check(isinstance(values, (list, np.ndarray)),
+          'type(values) = %s; must be a list or np.ndarray.' % type(values))
+    values = np.asarray(values)
+    check(np.issubdtype(values.dtype, np.number),
+          'values must contain only numbers.')
+    check(values.shape == indices.shape or
+          values.shape == indices.shape + (len(cols),),
+          'values.shape = %s; must be %s or %s.' %
+          (values.shape, indices.shape, indices.shape + (len(cols),)))
+
+    # compute saliency matrices, or return them to be computed when accessed
+    if as_dataframes:
+        return _SaliencyMatrices(indices, values, cols)
+    else:
+        return _fill_saliency(indices, values, len(cols))
+
@@ -0,0 +1,235 @@
+from __future__ import division
+import os
+import sys
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+
+# Import stuff from logomaker
+from logomaker.src.Logo import Logo
+from logomaker.src.Glyph import _get_glyph_outline
+from logomaker.src.error_handling import check, handle_errors
+
+# File formats supported by render_logos
+VALID_FILE_FORMATS = ['png', 'svg', 'pdf']
+
+
+@handle_errors
+def render_logos(logos,
+                 output_dir,
+                 file_format='png',
+                 file_prefix='logo',
+                 dpi=None,
+                 max_workers=None,
+                 mp_context=None,
+                 **kwargs):
+    """
+    Renders many logos to image files in parallel, using a pool of worker
+    processes. Each worker is warmed up once, when it starts, by loading
+    the fonts and glyph outlines used by the first logos, and is then reused
+    for all the logos it renders. Figures are created without pyplot, so no
+    global figure state is kept in the workers. Logos are read from logos
+    as rendering proceeds, and at most 2*max_workers of them are queued for
+    rendering at any time.
+
+    parameters
+    ----------
+
+    logos: (iterable)
+        The logos to render. Each element is either a matrix (pd.DataFrame)
+        to pass to the Logo constructor, or a (matrix, kwargs) tuple in
+        which kwargs is a dictionary of keyword arguments to pass to the
+        Logo constructor for that matrix only. Can be a generator, so that
+        matrices need not all be held in memory.
+
+    output_dir: (str)
+        Directory in which to save image files. Is created if it does not
+        exist.
+
+    file_format: (str)
+        Format of the image files. Must be one of 'png', 'svg', or 'pdf'.
+
+    file_prefix: (str)
+        Image files are named '<file_prefix>_<n>.<file_format>', where n
+        is the index of the logo in logos.
+
+    dpi: (float or None)
+        Resolution of the image files, in dots per inch. If None, the
+        matplotlib default is used.
+
+    max_workers: (int or None)
+        Number of worker processes. If None, the number of processors on
+        the machine is used.
+
+    mp_context: (multiprocessing context or None)
+        Context used to start worker processes, as passed to
+        concurrent.futures.ProcessPoolExecutor. Requires Python 3.7 or
+        later, as does the warming up of workers; in earlier versions,
+        workers are not warmed up.
+
+    **kwargs:
+        Keyword arguments to pass to the Logo constructor for all logos,
+        E.g., color_scheme='classic'. Per-logo keyword arguments take
+        precedence over these.
+
+    returns
+    -------
+    file_names: (list of str)
+        Names of the image files, in the same order as logos.
+    """
+
+    # validate output_dir
+    check(isinstance(output_dir, str),
+          'type(output_dir) = %s; must be of type str' % type(output_dir))
+
+    # validate file_format
+    check(file_format in VALID_FILE_FORMATS,
+          'file_format = %s; must be one of %s' %
+          (repr(file_format), VALID_FILE_FORMATS))
+
+    # validate file_prefix
+    check(isinstance(file_prefix, str),
+          'type(file_prefix) = %s; must be of type str' % type(file_prefix))
+
+    # validate dpi
+    if dpi is not None:
+        check(isinstance(dpi, (int, float)) and not isinstance(dpi, bool)
+              and dpi > 0,
+              'dpi = %s; must be None or a positive number' % repr(dpi))
+
+    # validate max_workers
+    if max_workers is not None:
+        check(isinstance(max_workers, int) and
+              not isinstance(max_workers, bool) and max_workers >= 1,
+              'max_workers = %s; must be None or an int >= 1' %
+              repr(max_workers))
+
+    # validate mp_context, which ProcessPoolExecutor only accepts in
+    # Python 3.7 or later
+    check(mp_context is None or sys.version_info >= (3, 7),
+          'mp_context requires Python 3.7 or later; must be None')
+
+    # get iterator over logos
+    check(not isinstance(logos, (str, pd.DataFrame)),
+          'logos must be an iterable of matrices or (matrix, kwargs) tuples')
+    try:
+        logos = iter(logos)
+    except TypeError:
+        check(False, 'type(logos) = %s is not iterable' % type(logos))
+
+    # get number of workers
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    # get (matrix, kwargs) tuples for the first logos, which are used to
+    # warm up workers
+    first_tasks = [_get_task(n, logo, kwargs) for n, logo in
+                   enumerate(islice(logos, 2 * max_workers))]
+    tasks = chain(first_tasks,
+                  (_get_task(n, logo, kwargs) for n, logo in
+                   enumerate(logos, len(first_tasks))))
+
+    # create output directory if necessary
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    # set up warm-up of workers, and mp_context, which ProcessPoolExecutor
+    # only accepts in Python 3.7 or later
+    executor_kwargs = {}
+    if sys.version_info >= (3, 7):
+        executor_kwargs = dict(mp_context=mp_context,
+                               initializer=_warm_up,
+                               initargs=_get_warm_up_args(first_tasks))
+
+    # render logos using a pool of warmed-up workers
+    file_names = []
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             **executor_kwargs) as executor:
+        for n, (df, logo_kwargs) in enumerate(tasks):
+            file_name = os.path.join(output_dir, '%s_%d.%s' %
+                                     (file_prefix, n, file_format))
+            file_names.append(file_name)
+            pending.append(executor.submit(_render_logo, df, logo_kwargs,
+                                           file_name, file_format, dpi))
+
+            # limit the number of logos held in memory
+            if len(pending) >= 2 * max_workers:
+                pending.popleft().result()
+
+        # wait for remaining logos to be rendered
+        while len(pending) > 0:
+            pending.popleft().result()
+
+    return file_names
+
+
+def _get_task(n, logo, kwargs):
+    """
+    Returns the (matrix, kwargs) tuple for rendering the n-th element of
+    logos passed to render_logos(). kwargs are the keyword arguments for
+    all logos, updated with any keyword arguments for this logo.
+    """
+    if isinstance(logo, tuple):
+        check(len(logo) == 2 and isinstance(logo[1], dict),
+              'logos[%d] is a tuple; must be a (matrix, kwargs) tuple '
+              'in which kwargs is a dict' % n)
+        df, logo_kwargs = logo
+    else:
+        df, logo_kwargs = logo, {}
+    check(isinstance(df, pd.DataFrame),
+          'type(logos[%d]) = %s; must be a pd.DataFrame ' % (n, type(df))
+          + 'or a (pd.DataFrame, dict) tuple')
+    all_kwargs = dict(kwargs)
+    all_kwargs.update(logo_kwargs)
+    return df, all_kwargs
+
+
+def _get_warm_up_args(tasks):
+    """
+    Returns the characters and font settings used by the logos to be
+    rendered, as arguments for _warm_up().
+    """
+
+    # get characters
+    chars = set()
+    for df, _ in tasks:
+        chars.update(str(c) for c in df.columns)
+    chars = sorted(c for c in chars if len(c) == 1)
+
+    # get font settings
+    fonts = set()
+    for _, logo_kwargs in tasks:
+        font_name = logo_kwargs.get('font_name', 'sans')
+        font_weight = logo_kwargs.get('font_weight', 'bold')
+        if isinstance(font_name, str) and isinstance(font_weight, (str, int)):
+            fonts.add((font_name, font_weight))
+
+    return chars, sorted(fonts, key=repr)
+
+
+def _warm_up(chars, fonts):
+    """
+    Runs once in each worker process before any logo is rendered. Loads
+    fonts and fills the glyph outline cache. Invalid settings are skipped
+    here; they are reported when the logos that use them are rendered.
+    """
+
+    for font_name, font_weight in fonts:
+        for c in chars:
+            for flip in (False, True):
+                try:
+                    _get_glyph_outline(c, font_name, font_weight, flip=flip)
+                except Exception:
+                    pass
+
+
+def _render_logo(df, logo_kwargs, file_name, file_format, dpi):
+    """
+    Renders a single logo to file_name in a worker process.
+    """
+
+    # draw logo on a figure created without pyplot, and save figure
+    logo = Logo(df, **dict(logo_kwargs, use_pyplot=False))
+    logo.fig.savefig(file_name, format=file_format, dpi=dpi)
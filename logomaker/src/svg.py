@@ -0,0 +1,119 @@
+from __future__ import division
+import numpy as np
+from matplotlib.path import Path
+from matplotlib.colors import to_hex
+
+# SVG path commands corresponding to matplotlib path codes
+_SVG_PATH_COMMANDS = {Path.MOVETO: 'M',
+                      Path.LINETO: 'L',
+                      Path.CURVE3: 'Q',
+                      Path.CURVE4: 'C'}
+
+
+def glyphs_to_svg(table, rows, xlim, ylim, width, height):
+    """
+    Returns an SVG document rendering the specified glyphs of a GlyphTable.
+    Each distinct glyph outline, i.e., each distinct combination of
+    character, font, flip, and mirror, is written once within <defs>, and
+    each glyph is written as a <use> element that places, scales, and colors
+    this outline.
+
+    parameters
+    ----------
+
+    table: (GlyphTable)
+        The table describing the glyphs.
+
+    rows: (array of ints)
+        The rows of table to render, in the order in which they are to be
+        drawn. Rows of glyphs with zero height are skipped.
+
+    xlim, ylim: ([float, float], [float, float])
+        The data coordinates at the left and right, and at the bottom and
+        top, of the rendered image.
+
+    width, height: (float, float)
+        Size of the rendered image in points.
+
+    returns
+    -------
+    svg: (str)
+        The SVG document.
+    """
+
+    defs = []
+    uses = []
+    def_ids = {}
+    for row in rows:
+
+        # get outline and placement of glyph; skip glyphs of zero height
+        placement = table.get_placement(row)
+        if placement is None:
+            continue
+        outline, transformation = placement
+
+        # define outline the first time it is used
+        key = (table.codes[row], table.font_name[row],
+               table.font_weight[row], table.flip[row], table.mirror[row])
+        if key not in def_ids:
+            def_ids[key] = 'glyph%d' % len(def_ids)
+            defs.append('  <path id="%s" d="%s"/>' %
+                        (def_ids[key], _path_to_svg(outline)))
+
+        # set fill, and stroke if glyph has an edge
+        alpha = table.alpha[row]
+        style = 'fill="%s" fill-opacity="%s"' % \
+                (to_hex(table.color[row]), _format_number(alpha))
+        if table.edgewidth[row] > 0:
+            style += ' stroke="%s" stroke-opacity="%s" stroke-width="%s" ' \
+                     'vector-effect="non-scaling-stroke"' % \
+                     (to_hex(table.edgecolor[row]), _format_number(alpha),
+                      _format_number(table.edgewidth[row]))
+
+        uses.append('  <use xlink:href="#%s" transform="%s" %s/>' %
+                    (def_ids[key], _matrix_to_svg(transformation.get_matrix()),
+                     style))
+
+    # map data coordinates to image coordinates, in which y increases
+    # downward
+    xscale = width / (xlim[1] - xlim[0])
+    yscale = height / (ylim[1] - ylim[0])
+    data_to_image = np.array([[xscale, 0, -xscale * xlim[0]],
+                              [0, -yscale, yscale * ylim[1]],
+                              [0, 0, 1]])
+
+    lines = ['<?xml version="1.0" encoding="utf-8" standalone="no"?>',
+             '<svg xmlns="http://www.w3.org/2000/svg" '
+             'xmlns:xlink="http://www.w3.org/1999/xlink" version="1.1" '
+             'width="%spt" height="%spt" viewBox="0 0 %s %s">' %
+             tuple(_format_number(x) for x in (width, height, width, height)),
+             ' <defs>'] + defs + \
+            [' </defs>',
+             ' <g transform="%s">' % _matrix_to_svg(data_to_image)] + uses + \
+            [' </g>',
+             '</svg>']
+    return '\n'.join(lines) + '\n'
+
+
+def _path_to_svg(path):
+    """ Returns the SVG path data describing a matplotlib path. """
+    commands = []
+    for vertices, code in path.iter_segments(simplify=False, curves=True):
+        if code == Path.CLOSEPOLY:
+            commands.append('Z')
+        else:
+            commands.append(_SVG_PATH_COMMANDS[code] +
+                            ' '.join(_format_number(x) for x in vertices))
+    return ''.join(commands)
+
+
+def _matrix_to_svg(matrix):
+    """ Returns the SVG transform describing a 3x3 affine matrix. """
+    values = (matrix[0, 0], matrix[1, 0], matrix[0, 1], matrix[1, 1],
+              matrix[0, 2], matrix[1, 2])
+    return 'matrix(%s)' % ' '.join(_format_number(x) for x in values)
+
+
+def _format_number(x):
+    """ Formats a number compactly for SVG output. """
+    return '%.6g' % x
@@ -1,14 +1,124 @@
 from __future__ import division
+import threading
+import zlib
+from contextlib import contextmanager
 import numpy as np
 import pandas as pd
 from logomaker.src.error_handling import check, handle_errors
 
+# Key in DataFrame.attrs under which validated matrices are marked
+VALIDATED_KEY = '_logomaker_validated'
+
+# Levels of validation that can be performed
+VALIDATION_LEVELS = ('full', 'fast', 'off')
+
+# Global validation level, and thread-local storage for the validation
+# level set by validation_level() in the current thread, if any
+_global_validation_level = 'full'
+_local_validation_level = threading.local()
+
+
+@handle_errors
+def set_validation_level(level):
+    """
+    Sets the global level of validation performed by Logomaker.
+
+    parameters
+    ----------
+
+    level: (str)
+        One of:
+        'full': All inputs are fully validated. This is the default.
+        'fast': Only checks whose cost does not grow with the size of the
+            data, e.g., checks of types, shapes, and dtypes, are performed.
+            Checks that scan matrix elements, sequences, or glyphs are
+            skipped, so inputs are assumed to be well-formed.
+        'off': As for 'fast', but validate_matrix() performs no checks at
+            all, and only returns a cleaned-up copy of the matrix, and the
+            inputs of Glyph objects are not checked.
+
+    returns
+    -------
+    None
+    """
+    global _global_validation_level
+    check(level in VALIDATION_LEVELS,
+          'level = %s; must be one of %s' % (repr(level), VALIDATION_LEVELS))
+    _global_validation_level = level
+
+
+def get_validation_level():
+    """
+    Returns the level of validation currently performed by Logomaker:
+    the level set by validation_level() in the current thread if any,
+    and otherwise the global level set by set_validation_level().
+
+    returns
+    -------
+    level: (str)
+        One of 'full', 'fast', or 'off'.
+    """
+    level = getattr(_local_validation_level, 'level', None)
+    return _global_validation_level if level is None else level
+
+
+@handle_errors
+def validation_level(level):
+    """
+    Returns a context manager that sets the level of validation performed by
+    Logomaker within a with block, e.g., for a single call:
+
+        with logomaker.validation_level('fast'):
+            logo = logomaker.Logo(df)
+
+    The level applies only to the current thread, and the previous level is
+    restored when the block is exited.
+
+    parameters
+    ----------
+
+    level: (str)
+        One of 'full', 'fast', or 'off'; see set_validation_level().
+
+    returns
+    -------
+    context: (context manager)
+        Context manager to use in a with statement.
+    """
+    check(level in VALIDATION_LEVELS,
+          'level = %s; must be one of %s' % (repr(level), VALIDATION_LEVELS))
+    return _validation_level_context(level)
+
+
+@contextmanager
+def _validation_level_context(level):
+    """ Sets the validation level of the current thread within a block. """
+    previous_level = getattr(_local_validation_level, 'level', None)
+    _local_validation_level.level = level
+    try:
+        yield
+    finally:
+        _local_validation_level.level = previous_level
+
+
+def _is_full_validation():
+    """
+    Returns True if checks whose cost grows with the size of the data are
+    to be performed, i.e., if the validation level is 'full'.
+    """
+    return get_validation_level() == 'full'
+
 
 @handle_errors
 def validate_matrix(df, matrix_type=None, allow_nan=False):
     """
     Checks to make sure that the input dataframe, df, represents a valid
-    matrix, i.e., an object that can be displayed as a logo.
+    matrix, i.e., an object that can be displayed as a logo. The returned
+    matrix is marked as validated, so validating it (or a copy of it) again
+    returns immediately, unless it has been changed in the meantime. If the
+    validation level (see set_validation_level()) is 'fast', only the shape
+    and dtypes of df are checked; if it is 'off', df is not checked. Rows of
+    probability matrices are renormalized at all levels.
 
     parameters
     ----------
@@ -36,9 +146,6 @@ def validate_matrix(df, matrix_type=None, allow_nan=False):
           'out_df needs to be a valid pandas out_df, ' 
           'out_df entered: %s' % type(df))
 
-    # create copy of df so we don't overwrite the user's data
-    out_df = df.copy()
-
     # check that type is valid
     check(matrix_type in {None, 'probability', 'information'},
           'matrix_type = %s; must be None, "probability", or "information"' %
@@ -48,6 +155,34 @@ def validate_matrix(df, matrix_type=None, allow_nan=False):
     check(isinstance(allow_nan, bool),
           'allow_nan must be of type bool; is type %s.' % type(allow_nan))
 
+    # if not performing full validation, just clean up df, checking only
+    # its shape and dtypes if the validation level is 'fast'. Rows of
+    # probability matrices are renormalized at all validation levels.
+    level = get_validation_level()
+    if level != 'full':
+        if level == 'fast':
+            check(df.shape[0] >= 1, 'df has zero rows. Needs multiple rows.')
+            check(df.shape[1] >= 1,
+                  'df has zero columns. Needs multiple columns.')
+            check(all(np.issubdtype(dtype, np.number) for dtype in df.dtypes),
+                  'df must contain only numbers.')
+        out_df = _clean_matrix(df)
+        if matrix_type == 'probability':
+            sums = out_df.values.sum(axis=1)
+            if not np.all(np.isclose(sums, 1.0)):
+                print('in validate_matrix(): Row sums in df are not close '
+                      'to 1. Reormalizing rows...')
+                out_df.loc[:, :] = out_df.values / sums[:, np.newaxis]
+        return out_df
+
+    # if df has already been validated in the same way and has not changed
+    # since, skip all other checks
+    if _is_validated(df, matrix_type, allow_nan):
+        return df.copy()
+
+    # create copy of df so we don't overwrite the user's data
+    out_df = df.copy()
+
     if not allow_nan:
         # make sure all entries are finite numbers
         check(np.isfinite(out_df.values).all(),
@@ -95,13 +230,13 @@ def validate_matrix(df, matrix_type=None, allow_nan=False):
           'not all values of df.index are unique. Make sure all are unique.')
 
     # if type is 'information', make sure elements are nonnegative
-    if matrix_type is 'information':
+    if matrix_type == 'information':
 
         # make sure all elements are nonnegative
         check(all(df.values.ravel() >= 0), 'not all values in df are >=0.')
 
     # if type is 'probability', make sure elements are valid probabilities
-    elif matrix_type is 'probability':
+    elif matrix_type == 'probability':
 
         # make sure all values are non-negative
         check(all(df.values.ravel() >= 0),
@@ -118,17 +253,94 @@ def validate_matrix(df, matrix_type=None, allow_nan=False):
         if not all(np.isclose(sums, 1.0)):
             print('in validate_matrix(): Row sums in df are not close to 1. '
                   'Reormalizing rows...')
-            df.loc[:, :] = df.values / sums[:, np.newaxis]
-            out_df = df.copy()
+            out_df.loc[:, :] = out_df.values / sums[:, np.newaxis]
 
     # nothing more to check if type is None
     elif matrix_type is None:
         pass
 
-    # return cleaned-up out_df
+    # mark out_df as validated, then return cleaned-up out_df
+    _mark_validated(out_df, matrix_type, allow_nan)
+    return out_df
+
+
+def _clean_matrix(df):
+    """
+    Returns a copy of df with columns sorted alphabetically and with index
+    named 'pos', without validating df.
+    """
+    out_df = df.copy()
+    if not out_df.columns.is_monotonic_increasing:
+        out_df = out_df[sorted(out_df.columns)]
+    out_df.index.name = 'pos'
     return out_df
 
 
+def _get_fingerprint(df):
+    """
+    Returns a fingerprint of the contents of a dataframe: its shape,
+    columns, index name, dtype, and checksums of its index and values.
+    Returns None if df contains Python objects, which cannot be
+    fingerprinted this way.
+    """
+    values = df.values
+    index = df.index.values
+    if values.dtype.kind == 'O' or index.dtype.kind == 'O':
+        return None
+    return (df.shape,
+            tuple(df.columns),
+            df.index.name,
+            str(values.dtype),
+            zlib.crc32(np.ascontiguousarray(index)),
+            zlib.crc32(np.ascontiguousarray(values)))
+
+
+def _get_validated_checks(df):
+    """
+    Returns the set of (matrix_type, allow_nan) validations that df has
+    passed, provided that df has not changed since; otherwise returns an
+    empty set.
+    """
+    mark = df.attrs.get(VALIDATED_KEY)
+    if mark is None:
+        return frozenset()
+    fingerprint, checks = mark
+    if fingerprint is None or fingerprint != _get_fingerprint(df):
+        return frozenset()
+    return checks
+
+
+def _is_validated(df, matrix_type=None, allow_nan=False):
+    """
+    Returns True if df has been marked as a valid matrix of the specified
+    type by _mark_validated(), and has not changed since. A matrix validated
+    with allow_nan=False is also valid with allow_nan=True.
+    """
+    checks = _get_validated_checks(df)
+    return (matrix_type, allow_nan) in checks or \
+        (matrix_type, False) in checks
+
+
+def _mark_validated(df, matrix_type=None, allow_nan=False):
+    """
+    Marks df, in place, as a valid matrix of the specified type, so that
+    validate_matrix() can return immediately. The mark is stored in
+    df.attrs together with a fingerprint of the contents of df; if df is
+    changed, or if the mark is passed on to a different dataframe, the
+    fingerprint no longer matches and the mark is ignored. df is only marked
+    if the validation level is 'full', since at lower levels the checks that
+    the mark vouches for may have been skipped.
+    """
+
+    # only mark matrices that have been fully validated
+    if not _is_full_validation():
+        return
+
+    checks = _get_validated_checks(df) | {(matrix_type, allow_nan),
+                                          (None, allow_nan)}
+    df.attrs[VALIDATED_KEY] = (_get_fingerprint(df), frozenset(checks))
+
+
 @handle_errors
 def validate_probability_mat(df):
     """
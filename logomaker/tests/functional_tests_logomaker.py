@@ -4,6 +4,8 @@ import sys
 sys.path.append('../../')
 
 import logomaker
+from logomaker.src.error_handling import PRODUCTION_MODE, \
+    call_with_should_fail
 
 import numpy as np
 import pandas as pd
@@ -42,10 +44,17 @@ def test_for_mistake(func, *args, **kw):
     print('Test # %d: ' % test_num, end='')
     #print('Test # %d: ' % test_num)
 
-    # Run function
-    obj = func(*args, **kw)
+    # Run function. In production mode, functions are not decorated by
+    # handle_errors, so should_fail is handled here instead
+    if PRODUCTION_MODE:
+        should_fail = kw.pop('should_fail')
+        _, mistake = call_with_should_fail(func, should_fail, *args, **kw)
+    else:
+        obj = func(*args, **kw)
+        mistake = obj.mistake
+
     # Increment appropriate counter
-    if obj.mistake:
+    if mistake:
         global_fail_counter += 1
     else:
         global_success_counter += 1
@@ -202,6 +211,124 @@ def test_Logo():
                           fail_list=['x',1,True],
                           success_list=[temp_ax, None], df=good_crp_df)
 
+    # test parameter use_collection
+    test_parameter_values(func=logomaker.Logo, var_name='use_collection',
+                          fail_list=bool_fail_list,
+                          success_list=bool_success_list, df=good_crp_df)
+
+    # test parameter use_pyplot
+    test_parameter_values(func=logomaker.Logo, var_name='use_pyplot',
+                          fail_list=bool_fail_list,
+                          success_list=bool_success_list, df=good_crp_df)
+
+
+def render_logo(logo):
+    """
+    Draws the figure of a Logo and returns its pixels as an array
+    """
+    logo.fig.canvas.draw()
+    return np.array(logo.fig.canvas.buffer_rgba())
+
+
+def test_Logo_glyph_edits():
+
+    good_crp_df = logomaker.get_example_matrix('crp_energy_matrix', print_description=False)
+
+    # editing a Glyph of glyph_df directly must change the rendered logo in
+    # the same way as styling it through the Logo, with or without collections
+    for use_collection in bool_success_list:
+        logo = logomaker.Logo(good_crp_df, use_collection=use_collection)
+        unedited = render_logo(logo)
+        logo.glyph_df.loc[3, 'A'].set_attributes(color='red')
+        edited = render_logo(logo)
+
+        styled_logo = logomaker.Logo(good_crp_df, use_collection=use_collection)
+        styled_logo.style_single_glyph(p=3, c='A', color='red')
+
+        assert not np.array_equal(edited, unedited)
+        assert np.array_equal(edited, render_logo(styled_logo))
+
+        # styling that fails on any attribute must not change any glyph
+        test_parameter_values(func=logo.style_glyphs_where, var_name='alpha',
+                              fail_list=[2, [0.5, 0.5]], success_list=[],
+                              mask=good_crp_df.values > 0, color='blue')
+        assert not logo.glyph_table.dirty.any()
+        assert np.array_equal(render_logo(logo), edited)
+
+    plt.close('all')
+
+
+def test_Logo_glyph_collections():
+
+    good_crp_df = logomaker.get_example_matrix('crp_energy_matrix', print_description=False)
+
+    logo = logomaker.Logo(good_crp_df, use_collection=True, zorder=3)
+    render_logo(logo)
+    collection = logo._glyph_collections[3]
+    paths = list(collection.get_paths())
+
+    # paths are kept when only the appearance of glyphs changes
+    logo.style_glyphs(color='red', alpha=0.5)
+    logo.style_glyphs_where(good_crp_df.values > 0, flip=False, edgewidth=1)
+    assert not collection._stale_paths.any()
+    assert all(new is old for new, old in zip(collection.get_paths(), paths))
+
+    # paths are recomputed for glyphs whose geometry changes, and only for these
+    logo.style_single_glyph(p=3, c='A', width=0.5)
+    stale_paths = collection._stale_paths.copy()
+    assert stale_paths.sum() == 1
+    new_paths = collection.get_paths()
+    assert all((new is old) != stale for new, old, stale in zip(new_paths, paths, stale_paths))
+
+    plt.close('all')
+
+
+def test_Logo_batch_update():
+
+    good_crp_df = logomaker.get_example_matrix('crp_energy_matrix', print_description=False)
+
+    for use_collection in bool_success_list:
+
+        # logo styled without batching, for comparison
+        styled_logo = logomaker.Logo(good_crp_df, use_collection=use_collection)
+        styled_logo.style_glyphs(color_scheme='classic')
+        styled_logo.style_single_glyph(p=3, c='A', color='red')
+        styled = render_logo(styled_logo)
+
+        for raise_error in bool_success_list:
+            logo = logomaker.Logo(good_crp_df, use_collection=use_collection)
+            unstyled = render_logo(logo)
+
+            # count the updates of artists that are not deferred
+            num_updates = [0]
+            update_artists = logo._update_artists
+
+            def counting_update_artists():
+                if logo._batch_depth == 0:
+                    num_updates[0] += 1
+                update_artists()
+
+            logo._update_artists = counting_update_artists
+
+            # artists must not be updated within the block
+            try:
+                with logo.batch_update():
+                    logo.style_glyphs(color_scheme='classic')
+                    logo.style_single_glyph(p=3, c='A', color='red')
+                    assert num_updates[0] == 0
+                    assert np.array_equal(render_logo(logo), unstyled)
+                    if raise_error:
+                        raise ValueError('error within batch_update() block')
+            except ValueError:
+                assert raise_error
+
+            # artists must be updated once on exit, even if an error was raised
+            assert logo._batch_depth == 0
+            assert num_updates[0] == 1
+            assert np.array_equal(render_logo(logo), styled)
+
+    plt.close('all')
+
 
 def test_Logo_style_glyphs():
 
@@ -267,6 +394,30 @@ def test_Logo_style_single_glyph():
     test_parameter_values(func=logomaker.Logo(good_crp_df).style_single_glyph, var_name='c',
                           fail_list=[-1, 'x', 1.1], success_list=['A','C','G','T'], p=1)
 
+    # test string-valued glyph attributes
+    test_parameter_values(func=logomaker.Logo(good_crp_df).style_single_glyph, var_name='font_name',
+                          fail_list=[1, ['sans', 'serif']], success_list=['DejaVu Serif'], p=1, c='A')
+
+    # glyphs styled individually must render, with or without collections
+    for use_collection in bool_success_list:
+        logo = logomaker.Logo(good_crp_df, use_collection=use_collection)
+        logo.style_single_glyph(p=1, c='A', font_name='DejaVu Serif', flip=True, color='red')
+        render_logo(logo)
+    plt.close('all')
+
+
+def test_Logo_style_glyphs_where():
+
+    good_crp_df = logomaker.get_example_matrix('crp_energy_matrix', print_description=False)
+
+    # test parameter mask
+    test_parameter_values(func=logomaker.Logo(good_crp_df).style_glyphs_where, var_name='mask',
+                          fail_list=[-1, 'x', np.ones([26, 4]), np.ones([10, 4], dtype=bool), [(0, 'X')], [(100, 'A')],
+                                     lambda df: df.values[:10] > 0],
+                          success_list=[good_crp_df.values > 0, good_crp_df > 0, lambda df: df > 0.5,
+                                        [(0, 'A'), (10, 'C')], []],
+                          color='red')
+
 
 def test_Logo_style_glyphs_in_sequence():
 
@@ -405,6 +556,121 @@ def test_Logo_style_spines():
     test_parameter_values(func=logomaker.Logo(good_crp_df).style_spines, var_name='bounds',
                           fail_list=['xxx', -1], success_list=[None,[0,1]])
 
+def test_Logo_save_svg():
+
+    import tempfile
+    import io
+    output_dir = tempfile.mkdtemp()
+
+    good_crp_df = logomaker.get_example_matrix('crp_energy_matrix', print_description=False)
+
+    # test parameter fname
+    test_parameter_values(func=logomaker.Logo(good_crp_df).save_svg, var_name='fname',
+                          fail_list=[1, None, ['logo.svg']],
+                          success_list=['%s/logo.svg' % output_dir, io.StringIO()])
+
+
+def test_validate_matrix():
+
+    good_crp_counts_df = logomaker.get_example_matrix('crp_counts_matrix', print_description=False)
+
+    # validated matrices changed after validation must be validated again
+    validated_df = logomaker.validate_matrix(good_crp_counts_df)
+    nan_df = logomaker.validate_matrix(good_crp_counts_df)
+    nan_df.iloc[0, 0] = np.nan
+    renamed_df = logomaker.validate_matrix(good_crp_counts_df)
+    renamed_df.columns = ['A', 'C', 'G', 'TT']
+    reindexed_df = logomaker.validate_matrix(good_crp_counts_df)
+    reindexed_df.index = [0] * len(reindexed_df)
+
+    # test parameter df
+    test_parameter_values(func=logomaker.validate_matrix, var_name='df',
+                          fail_list=['x', None, nan_df, renamed_df, reindexed_df],
+                          success_list=[good_crp_counts_df, validated_df, validated_df.copy(),
+                                        logomaker.transform_matrix(validated_df, center_values=True)])
+
+    # test parameter matrix_type
+    test_parameter_values(func=logomaker.validate_matrix, var_name='matrix_type',
+                          fail_list=['x', 'counts'], success_list=[None, 'probability', 'information'],
+                          df=logomaker.transform_matrix(validated_df, from_type='counts', to_type='probability'))
+
+    test_parameter_values(func=logomaker.validate_matrix, var_name='matrix_type',
+                          fail_list=['probability', 'information'], success_list=[None],
+                          df=logomaker.transform_matrix(validated_df, center_values=True))
+
+
+def test_validation_level():
+
+    good_crp_counts_df = logomaker.get_example_matrix('crp_counts_matrix', print_description=False)
+    nan_df = good_crp_counts_df.copy()
+    nan_df.iloc[0, 0] = np.nan
+
+    # test parameter level
+    test_parameter_values(func=logomaker.set_validation_level, var_name='level',
+                          fail_list=['x', None, 'FULL'], success_list=['off', 'fast', 'full'])
+
+    test_parameter_values(func=logomaker.validation_level, var_name='level',
+                          fail_list=['x', None, 'FULL'], success_list=['off', 'fast', 'full'])
+
+    # matrix elements are only checked when performing full validation
+    with logomaker.validation_level('fast'):
+        test_parameter_values(func=logomaker.validate_matrix, var_name='df',
+                              fail_list=['x', None, pd.DataFrame()],
+                              success_list=[good_crp_counts_df, nan_df])
+
+    with logomaker.validation_level('off'):
+        test_parameter_values(func=logomaker.validate_matrix, var_name='df',
+                              fail_list=[], success_list=[good_crp_counts_df, nan_df])
+
+    # matrices computed without full validation must be fully validated later
+    zero_df = 0 * good_crp_counts_df
+    with logomaker.validation_level('off'):
+        unchecked_dfs = [logomaker.transform_matrix(nan_df, normalize_values=True),
+                         logomaker.transform_matrix(zero_df, from_type='probability', to_type='weight'),
+                         logomaker.batch_transform_matrix([nan_df])[0]]
+    nan_saliency_df = logomaker.batch_saliency_to_matrix(['ACGT'], [[1, np.nan, 1, 1]], as_dataframes=True)[0]
+    test_parameter_values(func=logomaker.validate_matrix, var_name='df',
+                          fail_list=unchecked_dfs + [nan_saliency_df], success_list=[])
+
+    # levels set by validation_level() apply only to the current thread, and are restored on exit
+    import threading
+    thread_levels = []
+    with logomaker.validation_level('off'):
+        with logomaker.validation_level('fast'):
+            thread = threading.Thread(target=lambda: thread_levels.append(logomaker.get_validation_level()))
+            thread.start()
+            thread.join()
+            assert logomaker.get_validation_level() == 'fast'
+        assert logomaker.get_validation_level() == 'off'
+    assert logomaker.get_validation_level() == 'full'
+    assert thread_levels == ['full']
+
+    # validation levels do not change results: probability rows are renormalized at all levels
+    unnormalized_df = good_crp_counts_df + 1
+    normalized_df = logomaker.validate_matrix(unnormalized_df, matrix_type='probability')
+    information_df = logomaker.transform_matrix(unnormalized_df, from_type='probability', to_type='information')
+    for level in ['fast', 'off']:
+        with logomaker.validation_level(level):
+            pd.testing.assert_frame_equal(logomaker.validate_matrix(unnormalized_df, matrix_type='probability'),
+                                          normalized_df)
+            pd.testing.assert_frame_equal(logomaker.transform_matrix(unnormalized_df, from_type='probability',
+                                                                     to_type='information'),
+                                          information_df)
+
+    # inputs of Glyph objects are still checked at the 'fast' level
+    with logomaker.validation_level('fast'):
+        test_parameter_values(func=logomaker.Glyph, var_name='p',
+                              fail_list=['x', None], success_list=[0, 1.5],
+                              c='A', floor=0, ceiling=1)
+        test_parameter_values(func=logomaker.Glyph, var_name='c',
+                              fail_list=[1, None], success_list=['A'],
+                              p=1, floor=0, ceiling=1)
+
+    # the previous level is restored after the with block
+    test_parameter_values(func=logomaker.validate_matrix, var_name='df',
+                          fail_list=[nan_df], success_list=[good_crp_counts_df])
+
+
 def test_transform_matrix():
 
     good_crp_weight_df = logomaker.get_example_matrix('crp_energy_matrix', print_description=False)
@@ -445,7 +711,9 @@ def test_transform_matrix():
 
     # test parameter background
     test_parameter_values(func=logomaker.transform_matrix, var_name='background',
-                          fail_list=[1, 'x', [-1,1,1,1]], success_list=[None, [0.25,0.25,0.25,0.25]],
+                          fail_list=[1, 'x', [-1,1,1,1], [1,1,1], ['a','b','c','d'],
+                                     good_crp_counts_df.iloc[:5], good_crp_counts_df.iloc[:, :3]],
+                          success_list=[None, [0.25,0.25,0.25,0.25], np.array([1,2,3,4]), good_crp_counts_df + 1],
                           df=good_crp_counts_df, from_type='counts', to_type='information')
 
     # test parameter pseudocount
@@ -454,6 +722,53 @@ def test_transform_matrix():
                           df=good_crp_counts_df, from_type='counts', to_type='probability')
 
 
+def test_batch_transform_matrix():
+
+    good_crp_counts_df = logomaker.get_example_matrix('crp_counts_matrix', print_description=False)
+    counts_array = np.stack([good_crp_counts_df.values] * 3)
+    ragged_dfs = [good_crp_counts_df, good_crp_counts_df.iloc[:10], good_crp_counts_df[['T', 'G', 'C', 'A']]]
+
+    # test parameter matrices
+    test_parameter_values(func=logomaker.batch_transform_matrix, var_name='matrices',
+                          fail_list=['x', None, [], good_crp_counts_df, counts_array[0], -counts_array,
+                                     [good_crp_counts_df, good_crp_counts_df.iloc[:, :3]],
+                                     [good_crp_counts_df, good_crp_counts_df.values]],
+                          success_list=[counts_array, ragged_dfs, [counts_array[0], counts_array[1, :5]]],
+                          from_type='counts', to_type='information')
+
+    # test parameter center_values
+    test_parameter_values(func=logomaker.batch_transform_matrix, var_name='center_values',
+                          fail_list=bool_fail_list, success_list=bool_success_list,
+                          matrices=counts_array)
+
+    # test parameter from_type
+    test_parameter_values(func=logomaker.batch_transform_matrix, var_name='from_type',
+                          fail_list=[1, 'x', None], success_list=['counts'],
+                          matrices=counts_array, to_type='probability')
+
+    # test parameter to_type
+    test_parameter_values(func=logomaker.batch_transform_matrix, var_name='to_type',
+                          fail_list=[1, 'x', None], success_list=['probability', 'weight', 'information'],
+                          matrices=ragged_dfs, from_type='counts')
+
+    # test parameter background
+    test_parameter_values(func=logomaker.batch_transform_matrix, var_name='background',
+                          fail_list=[1, 'x', [-1, 1, 1, 1], [1, 1, 1], np.ones([2, 4]), np.ones([3, 5, 4])],
+                          success_list=[None, [0.25, 0.25, 0.25, 0.25], np.ones([3, 4]), counts_array + 1],
+                          matrices=counts_array, from_type='counts', to_type='information')
+
+    # test parameter pseudocount
+    test_parameter_values(func=logomaker.batch_transform_matrix, var_name='pseudocount',
+                          fail_list=[None, 'x', -1, [1, 2], [1, -1, 1]], success_list=[0, 1, 10, [0, 1, 10]],
+                          matrices=counts_array, from_type='counts', to_type='probability')
+
+    # test parameter lengths
+    test_parameter_values(func=logomaker.batch_transform_matrix, var_name='lengths',
+                          fail_list=['x', [1, 2], [0, 1, 2], [1, 2, 100], [1.5, 2, 3]],
+                          success_list=[None, [1, 5, 26], np.array([26, 26, 26])],
+                          matrices=counts_array, from_type='counts', to_type='information')
+
+
 def test_sequence_to_matrix():
 
     # test parameter seq
@@ -489,16 +804,46 @@ def test_sequence_to_matrix():
                            seq='ACGTACGT',to_type='weight')
 
 
+def test_batch_sequence_to_matrix():
+
+    # test parameter sequences
+    test_parameter_values(func=logomaker.batch_sequence_to_matrix, var_name='sequences',
+                          fail_list=[None, 'ACGT', [], ['ACGT', 'ACG'], ['ACGT', 3], np.zeros([2, 4])],
+                          success_list=[['ACGT'], ['ACGT', 'TTGA'], ('!@#$',), np.array([list('ACGT'), list('TTGA')])])
+
+    # test parameter cols
+    test_parameter_values(func=logomaker.batch_sequence_to_matrix, var_name='cols',
+                          fail_list=[0, True, ['A', 'C', 'G'], ['AC', 'G', 'T']],
+                          success_list=[None, ['A', 'C', 'G', 'T'], 'TGCA'],
+                          sequences=['ACGT', 'TTGA'])
+
+    # test parameter alphabet
+    test_parameter_values(func=logomaker.batch_sequence_to_matrix, var_name='alphabet',
+                          fail_list=[0, True, 'xxx', 'rna'], success_list=[None, 'dna'],
+                          sequences=['ACGT', 'TTGA'])
+
+    # test parameter is_iupac
+    test_parameter_values(func=logomaker.batch_sequence_to_matrix, var_name='is_iupac',
+                          fail_list=bool_fail_list, success_list=bool_success_list,
+                          sequences=['ACGT', 'TTGA'])
+
+    test_parameter_values(func=logomaker.batch_sequence_to_matrix, var_name='sequences',
+                          fail_list=[['ACGT', 'TTGX']], success_list=[['ACGT', 'RYSN']],
+                          is_iupac=True)
+
+
 def test_alignment_to_matrix():
 
     # get sequences from file
     with logomaker.open_example_datafile('crp_sites.fa', print_description=False) as f:
         raw_seqs = f.readlines()
+        file_name = f.name
     seqs = [seq.strip() for seq in raw_seqs if ('#' not in seq) and ('>') not in seq]
 
     # test parameter sequences
     test_parameter_values(func=logomaker.alignment_to_matrix,var_name='sequences',
-                          fail_list = [0,'x',['AACCT','AACGATA']], success_list = [seqs,['ACA','GGA']])
+                          fail_list = [0,'x',['AACCT','AACGATA'],iter(['AACCT','AACGATA']),iter([])],
+                          success_list = [seqs,['ACA','GGA'],file_name,iter(seqs)])
 
     # test parameter counts
     # TODO: need to find a working example for counts other than None
@@ -530,6 +875,108 @@ def test_alignment_to_matrix():
                           fail_list=[None, 'x', -1], success_list=[0, 1, 10],
                           sequences=seqs)
 
+    # test parameter n_jobs
+    test_parameter_values(func=logomaker.alignment_to_matrix, var_name='n_jobs',
+                          fail_list=[None, 'x', 0, -2, 1.5, True], success_list=[1, 2, -1],
+                          sequences=seqs)
+
+    # test parameter collapse_duplicates
+    test_parameter_values(func=logomaker.alignment_to_matrix, var_name='collapse_duplicates',
+                          fail_list=bool_fail_list, success_list=bool_success_list,
+                          sequences=seqs)
+
+    # test parameter sequences with collapse_duplicates
+    test_parameter_values(func=logomaker.alignment_to_matrix, var_name='sequences',
+                          fail_list=[[['A'], ['C']], [0, 1], ['AACCT', 'AACGATA', 'AACCT']],
+                          success_list=[seqs, ['ACA', 'GGA', 'ACA'], file_name, iter(seqs)],
+                          collapse_duplicates=True)
+
+    # test parameter counts with collapse_duplicates
+    test_parameter_values(func=logomaker.alignment_to_matrix, var_name='counts',
+                          fail_list=[[1], [1, 2, 3, 4], ['x', 'y', 'z']], success_list=[None, [1, 2, 3], [0, 0.5, 1]],
+                          sequences=['ACA', 'GGA', 'ACA'], collapse_duplicates=True)
+
+
+def test_encoded_alignment_to_matrix():
+
+    # integer codes and one-hot encodings of 'ACA', 'GGA'
+    codes = np.array([[0, 1, 0], [2, 2, 0]])
+    one_hot = np.eye(4)[codes]
+
+    # test parameter encoded_sequences
+    test_parameter_values(func=logomaker.encoded_alignment_to_matrix, var_name='encoded_sequences',
+                          fail_list=[0, ['ACA', 'GGA'], codes[0], codes.astype(float), codes + 2, -codes,
+                                     one_hot[:, :, :3], np.zeros([0, 3], dtype=int)],
+                          success_list=[codes, codes.astype(np.uint8), one_hot, one_hot.astype(bool)],
+                          alphabet='dna')
+
+    # test parameter alphabet
+    test_parameter_values(func=logomaker.encoded_alignment_to_matrix, var_name='alphabet',
+                          fail_list=[None, 0, '', 'AC', ['A', 'CG', 'T'], 'AACG'],
+                          success_list=['dna', 'rna', 'protein', 'ACG-', ['x', 'y', 'z']],
+                          encoded_sequences=codes)
+
+    # test parameter counts
+    test_parameter_values(func=logomaker.encoded_alignment_to_matrix, var_name='counts',
+                          fail_list=[0, 'x', [1], ['x', 'y']], success_list=[None, [1, 2], np.array([0.5, 1])],
+                          encoded_sequences=codes, alphabet='dna')
+
+    # test parameter to_type
+    test_parameter_values(func=logomaker.encoded_alignment_to_matrix, var_name='to_type',
+                          fail_list=[0, True, 'xxx'], success_list=['counts', 'probability', 'weight', 'information'],
+                          encoded_sequences=one_hot, alphabet='dna')
+
+
+def test_CountsAccumulator():
+
+    # accumulators for sequences of different lengths
+    def make_accumulator(seqs):
+        accumulator = logomaker.CountsAccumulator()
+        accumulator.add(seqs)
+        return accumulator
+    good_accumulator = make_accumulator(['ACA', 'GGA'])
+    bad_accumulator = make_accumulator(['ACGT'])
+
+    # test parameter sequences of add
+    test_parameter_values(func=logomaker.CountsAccumulator().add, var_name='sequences',
+                          fail_list=[0, 'x', ['AACCT', 'AACGATA']],
+                          success_list=[['ACA', 'GGA'], iter(['ACA', 'GGA']), []])
+
+    # test parameter sequences of add, validated and counted by workers
+    test_parameter_values(func=logomaker.CountsAccumulator().add, var_name='sequences',
+                          fail_list=[['AACCT', 'AACGATA'], ['AC\nA', 'GGAA'], ['ACA', 'G\nA']],
+                          success_list=[['ACA', 'GGA'], iter(['ACA', 'GGA'])],
+                          n_jobs=2)
+
+    # counts must not depend on the number of workers
+    seqs = ['ACGT', 'TTGA', 'CCAA', 'ACGA'] * 100
+    serial_accumulator = logomaker.CountsAccumulator()
+    serial_accumulator.add(seqs)
+    parallel_accumulator = logomaker.CountsAccumulator()
+    parallel_accumulator.add(seqs, n_jobs=2)
+    pd.testing.assert_frame_equal(serial_accumulator.to_matrix(),
+                                  parallel_accumulator.to_matrix())
+
+    # test parameter weights of add
+    test_parameter_values(func=logomaker.CountsAccumulator().add, var_name='weights',
+                          fail_list=[0, 'x', [1], ['x', 'y']], success_list=[None, [1, 2], np.array([0.5, 1])],
+                          sequences=['ACA', 'GGA'])
+
+    # test parameter other of merge
+    test_parameter_values(func=make_accumulator(['ACA']).merge, var_name='other',
+                          fail_list=[0, ['ACA'], bad_accumulator],
+                          success_list=[good_accumulator, logomaker.CountsAccumulator()])
+
+    # test parameter other of subtract
+    test_parameter_values(func=make_accumulator(['ACA', 'GGA', 'TTT']).subtract, var_name='other',
+                          fail_list=[0, bad_accumulator, make_accumulator(['ACC']), make_accumulator(['GGA'] * 4)],
+                          success_list=[make_accumulator(['ACA']), logomaker.CountsAccumulator()])
+
+    # test parameter to_type of to_matrix
+    test_parameter_values(func=good_accumulator.to_matrix, var_name='to_type',
+                          fail_list=[0, True, 'xxx'],
+                          success_list=['counts', 'probability', 'weight', 'information'])
+
 
 def test_saliency_to_matrix():
 
@@ -558,6 +1005,47 @@ def test_saliency_to_matrix():
                           seq=saliency_data_df['character'], values=saliency_data_df['value'])
 
 
+def test_batch_saliency_to_matrix():
+
+    # sequences and values of each position or of each character
+    sequences = ['ACGT', 'TTGA', 'CCAA']
+    values = np.arange(12.0).reshape(3, 4)
+    char_values = np.ones([3, 4, 4])
+
+    # test parameter sequences
+    test_parameter_values(func=logomaker.batch_saliency_to_matrix, var_name='sequences',
+                          fail_list=[None, 'ACGT', ['ACGT', 'TTGA'], ['ACGT', 'TTG', 'CCAA'], np.zeros([3, 4])],
+                          success_list=[sequences, np.array([list(seq) for seq in sequences])],
+                          values=values)
+
+    # test parameter values
+    test_parameter_values(func=logomaker.batch_saliency_to_matrix, var_name='values',
+                          fail_list=[None, 'x', values[:2], values.T, char_values[:, :, :3], [['x'] * 4] * 3],
+                          success_list=[values, values.tolist(), char_values, values.astype(int)],
+                          sequences=sequences)
+
+    # test parameter cols
+    test_parameter_values(func=logomaker.batch_saliency_to_matrix, var_name='cols',
+                          fail_list=[-1, 'ACG', ['AC', 'G', 'T']], success_list=[None, ['A', 'C', 'G', 'T'], 'TGCA'],
+                          sequences=sequences, values=values)
+
+    # test parameter alphabet
+    test_parameter_values(func=logomaker.batch_saliency_to_matrix, var_name='alphabet',
+                          fail_list=[0, True, 'xxx', 'rna'], success_list=[None, 'dna'],
+                          sequences=sequences, values=values)
+
+    # test parameter as_dataframes
+    test_parameter_values(func=logomaker.batch_saliency_to_matrix, var_name='as_dataframes',
+                          fail_list=bool_fail_list, success_list=bool_success_list,
+                          sequences=sequences, values=values)
+
+    # matrices of each sequence must equal those returned by saliency_to_matrix
+    matching_sequences = ['ACGT', 'TGCA', 'GATC']
+    saliency_dfs = logomaker.batch_saliency_to_matrix(matching_sequences, values, as_dataframes=True)
+    for i, seq in enumerate(matching_sequences):
+        pd.testing.assert_frame_equal(saliency_dfs[i], logomaker.saliency_to_matrix(seq, values[i]))
+
+
 def test_Glyph():
 
     fig, ax = plt.subplots(figsize=[7, 3])
@@ -658,6 +1146,41 @@ def test_Glyph():
                           success_list=[(10, 2.5), [5, 5]],
                           p=1, ceiling=1, floor=0, c='A', ax=ax)
 
+    # test parameter use_pyplot
+    test_parameter_values(func=logomaker.Glyph, var_name='use_pyplot',
+                          fail_list=bool_fail_list, success_list=bool_success_list,
+                          p=1, ceiling=1, floor=0, c='A')
+
+
+def test_render_logos():
+
+    import tempfile
+    output_dir = tempfile.mkdtemp()
+
+    good_crp_df = logomaker.get_example_matrix('crp_energy_matrix', print_description=False)
+    good_logos = [good_crp_df, (good_crp_df, {'color_scheme': 'classic'})]
+
+    # test parameter logos
+    test_parameter_values(func=logomaker.render_logos, var_name='logos',
+                          fail_list=[good_crp_df, 'x', 1, [1], [(good_crp_df, 'classic')], [good_crp_df] * 4 + [1]],
+                          success_list=[good_logos, iter(good_logos), [], (df for df in [good_crp_df] * 5)],
+                          output_dir=output_dir, max_workers=1)
+
+    # test parameter file_format
+    test_parameter_values(func=logomaker.render_logos, var_name='file_format',
+                          fail_list=['jpeg', 1, None], success_list=['png', 'svg', 'pdf'],
+                          logos=good_logos, output_dir=output_dir, max_workers=1)
+
+    # test parameter max_workers
+    test_parameter_values(func=logomaker.render_logos, var_name='max_workers',
+                          fail_list=[0, -1, 1.5, True], success_list=[None, 1, 2],
+                          logos=good_logos, output_dir=output_dir)
+
+    # test parameter kwargs: errors in workers are reported to caller
+    test_parameter_values(func=logomaker.render_logos, var_name='color_scheme',
+                          fail_list=['bad_color_scheme'], success_list=['classic'],
+                          logos=good_logos[:1], output_dir=output_dir, max_workers=1)
+
 
 def test_logomaker_get_data_methods():
 
@@ -701,27 +1224,40 @@ def run_tests():
 
     # run tests for the Logo class and it's helper methods
     test_Logo()
+    test_Logo_glyph_edits()
+    test_Logo_glyph_collections()
+    test_Logo_batch_update()
     test_Logo_style_glyphs()
     test_Logo_fade_glyphs_in_probability_logo()
     test_Logo_style_glyphs_below()
     test_Logo_style_single_glyph()
+    test_Logo_style_glyphs_where()
     test_Logo_style_glyphs_in_sequence()
     test_Logo_highlight_position()
     test_Logo_highlight_position_range()
     test_Logo_draw_baseline()
     test_Logo_style_xticks()
     test_Logo_style_spines()
+    test_Logo_save_svg()
 
     # run tests for the methods in the matrix module
+    test_validate_matrix()
+    test_validation_level()
     test_transform_matrix()
+    test_batch_transform_matrix()
     test_sequence_to_matrix()
+    test_batch_sequence_to_matrix()
     test_alignment_to_matrix()
+    test_encoded_alignment_to_matrix()
+    test_CountsAccumulator()
     test_saliency_to_matrix()
+    test_batch_saliency_to_matrix()
 
     # run tests for the Glyph class
     test_Glyph()
 
     #test_demo()
+    test_render_logos()
     test_logomaker_get_data_methods()
 
 if __name__ == '__main__':